@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import re
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from sheet_backends import SHEET_COLUMNS, CsvSheetBackend, sheet_backend_from_secrets
+from simulation import END_YEAR
+
+# ----------------------------------------------------
+# COLUMNAR ANALYTICS EXPORT
+# ----------------------------------------------------
+# Pulls the Master Control log in chunked batch_get reads, coerces every
+# column to its real type once, and appends it to a Parquet dataset
+# partitioned by team and year (hive layout: turns/Team_Name=.../Simulation_Year=.../).
+# manifest.json remembers the next unread sheet row, so a later run only
+# fetches and writes what was logged since. After each run the aggregates
+# are rebuilt from the local dataset, never from the sheet:
+#
+#   trajectories.parquet       team x year, stats of the team's latest run
+#   policy_mix.parquet         team x lever x level, turn count and share
+#   event_frequencies.parquet  team x event, count and share of turns
+#                              (the 2050 row draws no event and repeats the
+#                              previous one, so it is left out)
+#
+#   python analytics_export.py                       # Google Sheet from .streamlit/secrets.toml
+#   python analytics_export.py --csv data/log.csv    # offline CSV stand-in
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUT = os.path.join(BASE_DIR, "data", "analytics")
+
+SCHEMA = pa.schema([
+    ("Timestamp", pa.timestamp("s")),
+    ("Team_Name", pa.string()),
+    ("Simulation_Year", pa.int16()),
+    ("Carbon_Tax", pa.int16()),
+    ("Green_Subsidy", pa.int16()),
+    ("Regulation_Level", pa.int16()),
+    ("GDP_Trillion", pa.float64()),
+    ("CO2_Gt", pa.float64()),
+    ("Renewable_Percent", pa.float64()),
+    ("Public_Approval", pa.float64()),
+    ("Political_Capital", pa.float64()),
+    ("Global_Temp_Rise", pa.float64()),
+    ("Event_Name", pa.string()),
+    ("Status", pa.string()),
+    ("Cumulative_Score", pa.float64()),
+    ("Run_Seed", pa.int64()),
+    ("Event", pa.string()),
+    ("Sheet_Row", pa.int64()),
+])
+PARTITIONING = ds.partitioning(
+    pa.schema([("Team_Name", pa.string()), ("Simulation_Year", pa.int16())]), flavor="hive"
+)
+STAT_COLUMNS = [
+    "GDP_Trillion", "CO2_Gt", "Renewable_Percent", "Public_Approval",
+    "Political_Capital", "Global_Temp_Rise", "Cumulative_Score"
+]
+POLICY_LEVERS = ["Carbon_Tax", "Green_Subsidy", "Regulation_Level"]
+
+# "🚨 ALERT: Super-Typhoon - Coastal cities flooded..." -> "Super-Typhoon"
+ALERT_PATTERN = re.compile(r"ALERT:\s*(.+?)\s+-\s")
+NO_EVENT = "None"
+
+
+def event_name(text):
+    match = ALERT_PATTERN.search(text or "")
+    return match.group(1) if match else NO_EVENT
+
+
+def parse_timestamps(values):
+    # Text from the CSV stand-in or a FORMATTED_STRING read; a bare number is
+    # a Sheets serial date (days since 1899-12-30)
+    serials = pd.to_numeric(values, errors="coerce")
+    parsed = pd.to_datetime(values.where(serials.isna()), errors="coerce")
+    from_serials = pd.to_datetime(serials, unit="D", origin="1899-12-30", errors="coerce")
+    return parsed.fillna(from_serials).dt.round("s")
+
+
+def coerce_rows(rows, first_row):
+    # Sheet cells (numbers, or strings from the CSV stand-in) -> typed frame
+    width = len(SHEET_COLUMNS)
+    frame = pd.DataFrame([row[:width] + [""] * (width - len(row)) for row in rows], columns=SHEET_COLUMNS)
+    frame["Sheet_Row"] = range(first_row, first_row + len(frame))
+    frame["Timestamp"] = parse_timestamps(frame["Timestamp"])
+    for column in ["Simulation_Year", *POLICY_LEVERS, *STAT_COLUMNS]:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    # Nullable: rows logged before seeds were recorded have none
+    frame["Run_Seed"] = pd.to_numeric(frame["Run_Seed"], errors="coerce").astype("Int64")
+    for column in ("Team_Name", "Event_Name", "Status"):
+        frame[column] = frame[column].astype(str)
+    frame["Event"] = frame["Event_Name"].map(event_name)
+    # Rows without a team or year cannot be partitioned
+    frame = frame[(frame["Team_Name"] != "") & frame["Simulation_Year"].notna()]
+    return pa.Table.from_pandas(frame, schema=SCHEMA, preserve_index=False)
+
+
+def read_manifest(out_dir):
+    path = os.path.join(out_dir, "manifest.json")
+    if not os.path.exists(path):
+        return {"next_row": 2, "rows": 0}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, "manifest.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def export_turns(backend, out_dir, chunk_rows=2000):
+    # Appends the rows logged since the last run; returns how many were new
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = read_manifest(out_dir)
+    start = manifest["next_row"]
+    tables, next_row = [], start
+    for rows in backend.read_chunks(start, chunk_rows):
+        tables.append(coerce_rows(rows, next_row))
+        next_row += len(rows)
+    if next_row == start:
+        return 0
+
+    table = pa.concat_tables(tables)
+    if table.num_rows:
+        ds.write_dataset(
+            table, os.path.join(out_dir, "turns"), format="parquet",
+            partitioning=PARTITIONING,
+            # One new file per partition per run, named after the first sheet row it holds
+            basename_template=f"part-{start:08d}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore"
+        )
+    manifest.update(next_row=next_row, rows=manifest["rows"] + table.num_rows)
+    write_manifest(out_dir, manifest)
+    return table.num_rows
+
+
+def load_turns(out_dir):
+    return ds.dataset(
+        os.path.join(out_dir, "turns"), format="parquet", partitioning=PARTITIONING
+    ).to_table().to_pandas()
+
+
+def build_aggregates(turns):
+    # A team that reset has logged some years more than once: keep only the run
+    # of its last logged row, so no trajectory mixes runs. (Rows from before
+    # seeds were logged share one Run_Seed of null and count as one run.)
+    ordered = turns.sort_values("Sheet_Row")
+    latest_run = ordered.drop_duplicates("Team_Name", keep="last")[["Team_Name", "Run_Seed"]]
+    latest = ordered.merge(latest_run, on=["Team_Name", "Run_Seed"]).drop_duplicates(
+        ["Team_Name", "Simulation_Year"], keep="last"
+    )
+    trajectories = latest[["Team_Name", "Simulation_Year", *POLICY_LEVERS, *STAT_COLUMNS]].sort_values(
+        ["Team_Name", "Simulation_Year"]
+    )
+
+    levers = turns.melt(id_vars="Team_Name", value_vars=POLICY_LEVERS, var_name="Lever", value_name="Level")
+    policy_mix = levers.groupby(["Team_Name", "Lever", "Level"]).size().rename("Turns").reset_index()
+    policy_mix["Share"] = policy_mix["Turns"] / policy_mix.groupby(["Team_Name", "Lever"])["Turns"].transform("sum")
+
+    events = turns[turns["Simulation_Year"] < END_YEAR].groupby(["Team_Name", "Event"]).size().rename("Count").reset_index()
+    events["Share"] = events["Count"] / events.groupby("Team_Name")["Count"].transform("sum")
+
+    return {
+        "trajectories": trajectories.reset_index(drop=True),
+        "policy_mix": policy_mix,
+        "event_frequencies": events
+    }
+
+
+def export(backend, out_dir=DEFAULT_OUT, chunk_rows=2000):
+    new_rows = export_turns(backend, out_dir, chunk_rows)
+    if not os.path.isdir(os.path.join(out_dir, "turns")):
+        return new_rows
+    for name, frame in build_aggregates(load_turns(out_dir)).items():
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), os.path.join(out_dir, f"{name}.parquet"))
+    return new_rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the Master Control log to partitioned Parquet")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--csv", help="read this CSV stand-in instead of the Google Sheet")
+    parser.add_argument("--chunk-rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    backend = CsvSheetBackend(args.csv) if args.csv else sheet_backend_from_secrets()
+    print(f"{export(backend, args.out, args.chunk_rows)} new rows exported to {args.out}")
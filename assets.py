@@ -0,0 +1,47 @@
+import base64
+import hashlib
+import mimetypes
+import os
+from functools import lru_cache
+
+import streamlit as st
+
+# ----------------------------------------------------
+# STATIC ASSETS
+# ----------------------------------------------------
+# Images live in ./static and are read, hashed and encoded at most once per
+# process. With static serving on (see .streamlit/config.toml) pages refer to
+# them by a fingerprinted /app/static URL, so the browser fetches and caches
+# the file once instead of receiving it inline on every rerun. Without it we
+# fall back to a data URI, still encoded only once.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+
+
+@lru_cache(maxsize=None)
+def read_asset(name):
+    path = os.path.join(STATIC_DIR, name)
+    if not os.path.exists(path):
+        return b""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def fingerprint(name):
+    return hashlib.sha1(read_asset(name)).hexdigest()[:12]
+
+
+@lru_cache(maxsize=None)
+def data_uri(name):
+    mime = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    return f"data:{mime};base64,{base64.b64encode(read_asset(name)).decode()}"
+
+
+@lru_cache(maxsize=None)
+def asset_url(name):
+    if st.get_option("server.enableStaticServing"):
+        # The ?v= fingerprint changes whenever the file does, so caches never go stale
+        return f"/app/static/{name}?v={fingerprint(name)}"
+    return data_uri(name)
@@ -1,16 +1,28 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
 import random
 import os
-import base64
-import gspread
 import math
-from google.oauth2.service_account import Credentials
+import threading
 import time
-from gspread.exceptions import APIError
+import uuid
+import importlib
+from sheet_backends import SHEET_TITLE, CsvSheetBackend, GspreadBackend
+from assets import asset_url
+from leaderboard import LeaderboardModel
+from metrics import REGISTRY, FileExporter
+# numpy, gspread, google-auth and everything built on them are imported only
+# where a page needs them (see SIMULATION IMPORTS below), so the landing page
+# renders with Streamlit alone.
+
+RERUN_STARTED = time.perf_counter()
+
+# Set by replicas.py when several app processes share one data directory
+REPLICA_ID = os.environ.get("UN_POLICY_REPLICA")
 
 ADMIN_PAUSED = st.secrets.get("admin", {}).get("paused", False)
+ADVISOR_ENABLED = st.secrets.get("advisor", {}).get("enabled", False)
+# Practice rounds: turns can be rewound and branched, and nothing is logged to the Master Sheet
+PRACTICE_MODE = st.secrets.get("practice", {}).get("enabled", False)
 
 if ADMIN_PAUSED:
     st.success("✅ Thanks for attending the simulation!")
@@ -23,11 +35,13 @@ SCOPE = [
     "https://www.googleapis.com/auth/drive"
 ]
 
-info = dict(st.secrets["gcp_service_account"])
-info["private_key"] = info["private_key"].replace("\\n", "\n")
-
-
-creds = Credentials.from_service_account_info(info, scopes=SCOPE)
+@st.cache_resource
+def get_credentials():
+    # Parsed once per process, not on every rerun, and not before a page needs the sheet
+    from google.oauth2.service_account import Credentials
+    info = dict(st.secrets["gcp_service_account"])
+    info["private_key"] = info["private_key"].replace("\\n", "\n")
+    return Credentials.from_service_account_info(info, scopes=SCOPE)
 
 TEAM_CREDENTIALS = {
     "Ssbian": "ssbian@2050",
@@ -55,88 +69,111 @@ TEAM_CREDENTIALS = {
 }
 
 
+def open_master_sheet():
+    import gspread
+    with REGISTRY.span("sheet_authorize"):
+        client = gspread.authorize(get_credentials())
+        return client.open(SHEET_TITLE).sheet1
+
+
 @st.cache_resource
-def get_master_sheet():
-    for attempt in range(5):
-        try:
-            client = gspread.authorize(creds)
-            return client.open("UN Policy Architect – Master Control").sheet1
-        except APIError:
-            if attempt == 4:
-                raise
-            time.sleep(2 ** attempt)
+def get_sheet_backend():
+    # offline_csv swaps the Google Sheet for a local file (offline mode / tests)
+    storage = st.secrets.get("storage", {})
+    if storage.get("offline_csv"):
+        return CsvSheetBackend(storage["offline_csv"])
+    return GspreadBackend(open_master_sheet)
 
-from datetime import datetime
 
-def clamp(value, min_val, max_val):
-    return max(min_val, min(value, max_val))
-
-
-def calculate_cumulative_score(
-    initial_gdp,
-    final_gdp,
-    initial_co2,
-    final_co2,
-    final_temp,
-    political_capital,
-    renewable_pct,
-    public_approval
-):
-    # 1. Political Capital (25%)
-    political_score = clamp(political_capital, 0, 100)
-    political_component = 0.15 * political_score
-
-    # 2. GDP Stability (20%)
-    if initial_gdp > 0:
-        gdp_growth_pct = ((final_gdp - initial_gdp) / initial_gdp) * 100
-    else:
-        gdp_growth_pct = 0  # safety fallback
+def get_data_dir():
+    data_dir = st.secrets.get("storage", {}).get("data_dir", os.path.join(BASE_DIR, "data"))
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
 
-    gdp_score = clamp(50 + gdp_growth_pct, 0, 100)
-    gdp_component = 0.25 * gdp_score
 
-    # 3. Carbon Reduction (20%)
-    if initial_co2 > 0:
-        carbon_reduction_pct = ((initial_co2 - final_co2) / initial_co2) * 100
-    else:
-        carbon_reduction_pct = 0  # safety fallback
-
-    carbon_score = clamp(carbon_reduction_pct, 0, 100)
-    carbon_component = 0.20 * carbon_score
-
-    # 4. Temperature Control (20%)
-    if final_temp <= 1.3:
-        temp_score = 100
-    elif final_temp <= 1.5:
-        temp_score = 80
-    elif final_temp <= 1.7:
-        temp_score = 40
-    else:
-        temp_score = 0
+@st.cache_resource
+def get_write_queue():
+    # One write-behind queue per process, shared by every team's session.
+    # Turns land in the local journal first and are synced in the background;
+    # across replicas only the holder of the writer lock talks to the sheet.
+    from sheet_queue import SheetWriteQueue
+    from turn_journal import TurnJournal
+    data_dir = get_data_dir()
+    journal = TurnJournal(os.path.join(data_dir, "turn_journal.sqlite3"))
+    return SheetWriteQueue(journal, get_sheet_backend(), writer_lock=os.path.join(data_dir, "sheet_writer.lock"))
+
+
+@st.cache_resource
+def get_checkpoint_store():
+    # Latest state per team, so a run survives a refresh or a server restart
+    from checkpoints import CheckpointStore
+    return CheckpointStore(os.path.join(get_data_dir(), "checkpoints.sqlite3"))
 
-    temp_component = 0.20 * temp_score
 
-    # 5. Renewable Energy (10%)
-    renewable_score = clamp(renewable_pct, 0, 100)
-    renewable_component = 0.13 * renewable_score
+@st.cache_resource
+def get_metrics_exporter():
+    # Prometheus textfile (data/metrics.prom, or one per replica), rewritten every few seconds
+    name = f"metrics-{REPLICA_ID}.prom" if REPLICA_ID else "metrics.prom"
+    return FileExporter(os.path.join(get_data_dir(), name))
 
-    # 6. Public Approval (5%)
-    approval_score = clamp(public_approval, 0, 100)
-    approval_component = 0.07 * approval_score
 
-    final_score = (
-        political_component +
-        gdp_component +
-        carbon_component +
-        temp_component +
-        renewable_component +
-        approval_component
-    )
+def record_rerun():
+    # Call right before the script finishes or stops
+    REGISTRY.observe(f"rerun_{st.session_state.page}", time.perf_counter() - RERUN_STARTED)
+
+
+LEADERBOARD_TTL = 15  # seconds between sheet reads, however many viewers
+
+
+@st.cache_resource
+def get_leaderboard():
+    # One read model per process; every viewer shares its incremental sheet reads
+    return LeaderboardModel(get_sheet_backend(), ttl=LEADERBOARD_TTL)
+
+
+SPECTATOR_REFRESH = 2  # seconds between a viewer's looks at the in-memory feed
+
+
+@st.cache_resource
+def get_spectator_feed():
+    # One per process: every turn logged here is published to it in memory;
+    # the journal shared with other replicas fills in their teams' turns
+    from spectator import TrajectoryFeed
+    from turn_journal import TurnJournal
+    journal = TurnJournal(os.path.join(get_data_dir(), "turn_journal.sqlite3"))
+    return TrajectoryFeed(journal, poll=SPECTATOR_REFRESH)
+
+
+# Everything the simulation page imports beyond the landing page
+SIMULATION_MODULES = (
+    "numpy", "gspread", "google.oauth2.service_account",
+    "simulation", "scoring", "turn_history", "checkpoints", "sheet_queue",
+    "turn_journal", "charts", "solver", "projection", "spectator", "timeline"
+)
 
-    return round(final_score, 2)
+
+@st.cache_resource
+def warm_up_imports():
+    # Once per process, after the landing page has been sent: load the
+    # simulation page's modules in the background so the first login does
+    # not pay for them. Import locks make a concurrent page import just wait.
+    def load():
+        with REGISTRY.span("import_warmup"):
+            for name in SIMULATION_MODULES:
+                try:
+                    importlib.import_module(name)
+                except ImportError:
+                    # Left for the simulation page to import, and report, itself
+                    pass
+
+    thread = threading.Thread(target=load, name="import-warmup", daemon=True)
+    thread.start()
+    return thread
+
+from datetime import datetime
 
 
-def write_to_master_sheet(sheet):
+def write_to_master_sheet(queue):
     s = st.session_state.stats
 
     cumulative_score = calculate_cumulative_score(
@@ -165,18 +202,25 @@ def write_to_master_sheet(sheet):
         round(s['Global Temp Rise'], 2),                # Global_Temp_Rise
         st.session_state.last_event,                    # Event_Name
         "ONGOING" if not st.session_state.game_over else "ENDED",
-        cumulative_score
+        cumulative_score,
+        st.session_state.run_seed                       # Run_Seed
     ]
 
-    # ✅ SAFE APPEND (NO CRASH)
-    for attempt in range(5):
-        try:
-            sheet.append_row(row, value_input_option="USER_ENTERED")
-            break
-        except APIError:
-            if attempt == 4:
-                raise
-            time.sleep(2 ** attempt)
+    # ✅ SAFE APPEND (NO CRASH) — journaled locally, synced to the sheet in the background
+    ticket = queue.submit(
+        st.session_state.team_name,
+        st.session_state.run_id,
+        st.session_state.enacted_year,
+        row
+    )
+    # 📺 Straight to the spectator page, no sheet read involved
+    get_spectator_feed().publish(
+        st.session_state.team_name,
+        st.session_state.run_id,
+        st.session_state.enacted_year,
+        row
+    )
+    return ticket
 
 
 # ----------------------------------------------------
@@ -193,19 +237,133 @@ st.set_page_config(
 # ----------------------------------------------------
 if "page" not in st.session_state:
     st.session_state.page = "landing"
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+REGISTRY.touch_session(st.session_state.session_id)
 # ----------------------------------------------------
 # UTILS
 # ----------------------------------------------------
-def get_base64_image(image_path):
-    if not os.path.exists(image_path):
-        return ""
-    with open(image_path, "rb") as img_file:
-        return base64.b64encode(img_file.read()).decode()
-
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-LOGO_PATH = os.path.join(BASE_DIR, "LOGO.png")
-BG_PATH = os.path.join(BASE_DIR, "background.jpg")
-bg_image = get_base64_image(BG_PATH)
+# Encoded/fingerprinted once per process (assets.py), not on every rerun
+LOGO_URL = asset_url("LOGO.png")
+BG_URL = asset_url("background.jpg")
+get_metrics_exporter()
+
+# ----------------------------------------------------
+# ADMIN METRICS PAGE (open the app with ?admin in the URL)
+# ----------------------------------------------------
+if "admin" in st.query_params and st.session_state.page == "landing":
+    st.session_state.page = "admin"
+
+if st.session_state.page == "admin":
+    st.title("🛠️ Live Metrics")
+
+    if not st.session_state.get("admin_unlocked"):
+        admin_password = st.secrets.get("admin", {}).get("password")
+        entered = st.text_input("Admin Password", type="password")
+        if st.button("Unlock", type="primary"):
+            if admin_password and entered == admin_password:
+                st.session_state.admin_unlocked = True
+                st.rerun()
+            else:
+                st.error("Incorrect password")
+        record_rerun()
+        st.stop()
+
+    @st.fragment(run_every=5)
+    def metrics_panel():
+        counters = REGISTRY.counters()
+        gauges = REGISTRY.gauges()
+        col1, col2, col3, col4 = st.columns(4)
+        with col1: st.metric("Active Sessions", f"{gauges.get('active_sessions', 0):.0f}")
+        with col2: st.metric("Sheet API Calls", f"{counters.get('sheet_api_calls_total', 0):.0f}")
+        with col3: st.metric("Sheet Retries", f"{counters.get('sheet_retries_total', 0):.0f}")
+        with col4: st.metric("Backoff Slept", f"{counters.get('sheet_backoff_seconds_total', 0):.0f} s")
+
+        phases = [
+            {
+                "Phase": name,
+                "Count": row["count"],
+                "p50 (ms)": round(row["p50"] * 1000, 1),
+                "p95 (ms)": round(row["p95"] * 1000, 1),
+                "p99 (ms)": round(row["p99"] * 1000, 1)
+            }
+            for name, row in sorted(REGISTRY.percentiles().items())
+        ]
+        st.dataframe(phases, hide_index=True, use_container_width=True)
+        if gauges.get("sheet_writer_stopped"):
+            st.error(
+                f"Sheet writer stopped: {get_write_queue().error}. "
+                "Turns are still journaled; restart the app once the cause is fixed."
+            )
+        st.caption(
+            f"Rows waiting for the sheet: {gauges.get('sheet_pending_rows', 0):.0f} · "
+            f"last game state size: {gauges.get('session_state_bytes', 0):.0f} bytes · "
+            f"replica {REPLICA_ID or '-'}{' (sheet writer)' if gauges.get('sheet_writer', 1) else ''}"
+        )
+        with st.expander("Prometheus text"):
+            st.code(REGISTRY.render_prometheus(), language="text")
+
+    metrics_panel()
+    record_rerun()
+    st.stop()
+
+# ----------------------------------------------------
+# SPECTATOR PAGE (open the app with ?spectator in the URL)
+# ----------------------------------------------------
+# For the room display and judges' tabs: every team's trajectory overlaid,
+# served from the process-wide feed, so extra viewers cost no sheet reads.
+if "spectator" in st.query_params and st.session_state.page == "landing":
+    st.session_state.page = "spectator"
+
+if st.session_state.page == "spectator":
+    from spectator import SPECTATOR_METRICS
+    st.title("📺 Live Trajectories")
+    st.selectbox("Metric", list(SPECTATOR_METRICS), key="spectator_metric")
+
+    @st.fragment(run_every=SPECTATOR_REFRESH)
+    def spectator_chart():
+        feed = get_spectator_feed()
+        feed.sync()
+        if not feed.team_count:
+            st.info("No turns logged yet.")
+            return
+        st.plotly_chart(feed.figure(st.session_state.spectator_metric), use_container_width=True)
+        st.caption(f"{feed.team_count} teams · updates every {SPECTATOR_REFRESH}s")
+
+    spectator_chart()
+    record_rerun()
+    st.stop()
+
+# ----------------------------------------------------
+# LEADERBOARD PAGE
+# ----------------------------------------------------
+if st.session_state.page == "leaderboard":
+    st.title("🏆 Live Leaderboard")
+
+    @st.fragment(run_every=LEADERBOARD_TTL)
+    def leaderboard_table():
+        from gspread.exceptions import APIError
+        board = get_leaderboard()
+        try:
+            board.refresh()
+        except APIError:
+            st.warning("Master Sheet is busy, showing the last known standings.")
+        standings = board.top()
+        if standings:
+            st.dataframe(standings, hide_index=True, use_container_width=True)
+        else:
+            st.info("No policies logged yet.")
+        st.caption(f"Refreshes every {LEADERBOARD_TTL}s")
+
+    leaderboard_table()
+
+    if st.button("⬅️ Back", type="secondary"):
+        st.session_state.page = "landing"
+        st.rerun()
+
+    record_rerun()
+    st.stop()
 
 # ----------------------------------------------------
 # LANDING PAGE
@@ -264,7 +422,7 @@ if st.session_state.page == "landing":
         .stApp {{
             background-image:
                 linear-gradient(rgba(10,15,25,0.9), rgba(10,15,25,0.9)),
-                url("data:image/jpg;base64,{bg_image}");
+                url("{BG_URL}");
             background-size: cover;
             background-position: center;
         }}
@@ -294,9 +452,19 @@ if st.session_state.page == "landing":
             st.session_state.team_name = team_name
             st.session_state.authenticated = True
             st.session_state.page = "simulation"
+            # ♻️ Resume this team's run if one was checkpointed
+            checkpoint = get_checkpoint_store().load(team_name)
+            if checkpoint is not None:
+                st.session_state.update(checkpoint)
             st.success("Authentication successful")
             st.rerun()
+
+    if st.button("🏆 View Leaderboard", type="secondary"):
+        st.session_state.page = "leaderboard"
+        st.rerun()
     
+    warm_up_imports()
+    record_rerun()
     st.stop()  # ⛔ Prevents simulation from loading without auth
 
 
@@ -306,12 +474,26 @@ if st.session_state.page == "landing":
 if st.session_state.page != "simulation":
     st.stop()
 
+# ----------------------------------------------------
+# SIMULATION IMPORTS
+# ----------------------------------------------------
+# Usually already loaded in the background by warm_up_imports()
+from simulation import (
+    EVENTS, INITIAL_STATS, apply_policy, event_message, new_event_state, policy_costs, resolve_events, turn_rng
+)
+from turn_history import TurnHistory
+from scoring import calculate_cumulative_score
+from charts import get_chart, get_projection_chart
+from solver import solve_policy
+from projection import project, projection_key
+from timeline import Timeline
+
 # ----------------------------------------------------
 # SIDEBAR
 # ----------------------------------------------------
 with st.sidebar:
     st.image(
-        LOGO_PATH,
+        LOGO_URL,
         use_container_width=True
     )
     st.markdown(
@@ -343,7 +525,7 @@ st.markdown(
     .stApp {{
         background-image:
             linear-gradient(rgba(10,15,25,0.85), rgba(10,15,25,0.85)),
-            url("data:image/jpg;base64,{bg_image}");
+            url("{BG_URL}");
         background-size: cover;
         background-attachment: fixed;
     }}
@@ -360,94 +542,59 @@ st.markdown(
 # ----------------------------------------------------
 if 'year' not in st.session_state:
     st.session_state.year = 2025
-    st.session_state.stats = {
-        'GDP (Trillion $)': 5.0,
-        'CO2 (Gt)': 450,
-        'Global Temp Rise': 1.1,
-        'Public Approval': 60,
-        'Political Capital': 100, # Currency to spend on policies
-        'Renewable %': 15
-    }
-    st.session_state.history = pd.DataFrame(columns=st.session_state.stats.keys())
+    st.session_state.run_id = uuid.uuid4().hex[:12]
+    # Seeds this run's event stream; logged with every row so replay.py can verify it
+    st.session_state.run_seed = random.SystemRandom().getrandbits(40)
+    st.session_state.stats = dict(INITIAL_STATS)
+    st.session_state.event_state = new_event_state()
+    st.session_state.history = TurnHistory()
     st.session_state.game_over = False
     st.session_state.last_event = "Welcome, Delegate. The General Assembly awaits your first move."
     st.session_state.event_impact = ""
+if PRACTICE_MODE and "timeline" not in st.session_state:
+    # Rooted at a fresh run or at the checkpoint just restored
+    st.session_state.timeline = Timeline(st.session_state)
 
 # --- EVENT SYSTEM ---
-EVENTS = [
-    {"name": "Tech Breakthrough", "msg": "Scientists discover a fusion efficiency booster!", "effect": {"Renewable %": 5, "CO2 (Gt)": -10}},
-    {"name": "Super-Typhoon", "msg": "Coastal cities flooded. Infrastructure damaged.", "effect": {"GDP (Trillion $)": -0.2, "Public Approval": -10}},
-    {"name": "Oil Lobby Strike", "msg": "Fossil fuel giants freeze assets.", "effect": {"Political Capital": -20, "GDP (Trillion $)": -0.1}},
-    {"name": "Youth Climate Protest", "msg": "Millions march. Pressure mounts for action.", "effect": {"Political Capital": 15, "Public Approval": -5}},
-    {"name": "Geopolitical Tension", "msg": "Trade wars slow down solar panel imports.", "effect": {"Renewable %": -2, "GDP (Trillion $)": -0.15}}
-]
-
 def trigger_random_event():
-    if random.random() < 0.4: # 40% chance of event per turn
-        event = random.choice(EVENTS)
-        st.session_state.last_event = f"🚨 ALERT: {event['name']} - {event['msg']}"
-        
-        impact_text = []
+    event_state = st.session_state.event_state
+    ongoing = [EVENTS[i]['name'] for i, left in enumerate(event_state['active']) if left]
+    event = resolve_events(
+        st.session_state.stats,
+        turn_rng(st.session_state.run_seed, st.session_state.enacted_year),
+        event_state
+    )
+    st.session_state.last_event = event_message(event)
+
+    impact_text = []
+    if event is not None:
         for key, val in event['effect'].items():
-            st.session_state.stats[key] += val
             symbol = "⬆️" if val > 0 else "⬇️"
             impact_text.append(f"{key} {symbol} {abs(val)}")
-        
-        st.session_state.event_impact = " | ".join(impact_text)
-    else:
-        st.session_state.last_event = "🕊️ Status: Global situation stable."
-        st.session_state.event_impact = ""
+    if ongoing:
+        impact_text.append(f"Still in effect: {', '.join(ongoing)}")
+    st.session_state.event_impact = " | ".join(impact_text)
+
+# --- ADVISOR (optional hint panel) ---
+@st.cache_data(max_entries=256, show_spinner="Consulting the advisor...")
+def get_advice(stats_items, year):
+    # Keyed on the exact state, so every team in the same position shares one solve
+    return solve_policy(dict(stats_items), start_year=year, expected=True)
 
 # --- SIMULATION ENGINE ---
 def calculate_turn(tax, subsidy, regulation):
     s = st.session_state.stats
     
-    # 1. Costs (Political Capital)
-    cost = (tax * 2) + (subsidy * 3) + (regulation * 4)
-    if s['Political Capital'] < cost:
+    if not apply_policy(s, tax, subsidy, regulation):
         return False, "Not enough Political Capital! Lower your intensity."
 
-    # 2. Update Stats
-    s['Political Capital'] -= cost
-    s['Political Capital'] += 18 # Natural regeneration per turn
-    
-
-    # Economics
-    gdp_growth = 0.023 - (tax * 0.002) - (regulation * 0.001) + (subsidy * 0.0015)
-    s['GDP (Trillion $)'] *= (1 + gdp_growth)
-    
-    # Environment
-    co2_reduction = (tax * 3.2) + (subsidy * 2.7) + (regulation * 2.2)
-    s['CO2 (Gt)'] -= co2_reduction
-    s['Renewable %'] += (subsidy * 1.2)
-    
-    # Feedback Loops
-    if s['CO2 (Gt)'] > 400: s['Global Temp Rise'] += 0.05
-    else: s['Global Temp Rise'] += 0.01
-    
-    # Public Opinion
-    approval_change = 0
-    if gdp_growth < 0: approval_change -= 2
-    if s['Global Temp Rise'] > 1.5: approval_change -= 5
-    if subsidy > 5: approval_change += 3
-    s['Public Approval'] = max(0, min(100, s['Public Approval'] + approval_change))
-
-    # Clamp values
-    s['Renewable %'] = min(100, s['Renewable %'])
-    s['CO2 (Gt)'] = max(0, s['CO2 (Gt)'])
     # --- Record History (FIXED) ---
 
 # Save the year for which policy is enacted
    # --- Record History ---
     st.session_state.enacted_year = st.session_state.year
 
-    current_year_data = s.copy()
-    current_year_data["Year"] = st.session_state.enacted_year
-
-    st.session_state.history = pd.concat(
-        [st.session_state.history, pd.DataFrame([current_year_data])],
-        ignore_index=True
-    )
+    st.session_state.history.append(st.session_state.enacted_year, s)
 
 # --- END CONDITION CHECK (BEFORE increment) ---
     if st.session_state.enacted_year >= 2050:
@@ -463,10 +610,71 @@ def calculate_turn(tax, subsidy, regulation):
 
 
 # --- UI LAYOUT ---
+# Slider moves rerun only the controls fragment (sliders, advisor, what-if).
+# A logged turn or a reset reruns the whole app, which is the only time the
+# CSS, metrics, event box and history charts below are rebuilt.
+
+def show_projection(s, tax, subsidy, regulation):
+    # What-if for the policy currently on the sliders; nothing is logged
+    policy_cost = int(policy_costs() @ (tax, subsidy, regulation))
+    if policy_cost > s['Political Capital']:
+        st.warning(f"This policy costs {policy_cost} Political Capital; you have {s['Political Capital']:.0f}.")
+        return
+    key = projection_key(s, st.session_state.event_state, st.session_state.year, tax, subsidy, regulation)
+    with REGISTRY.span("projection"):
+        projection = project(*key)
+    nxt = projection["next"]
+    p1, p2 = st.columns(2)
+    with p1:
+        st.metric("GDP next year", f"${nxt['GDP (Trillion $)']:.2f} T", f"{nxt['GDP (Trillion $)'] - s['GDP (Trillion $)']:+.2f}")
+        st.metric("Temp next year", f"+{nxt['Global Temp Rise']:.2f}°C", f"{nxt['Global Temp Rise'] - s['Global Temp Rise']:+.2f}", delta_color="inverse")
+        st.metric("Approval next year", f"{nxt['Public Approval']:.0f}%", f"{nxt['Public Approval'] - s['Public Approval']:+.0f}")
+    with p2:
+        st.metric("CO2 next year", f"{nxt['CO2 (Gt)']:.0f} Gt", f"{nxt['CO2 (Gt)'] - s['CO2 (Gt)']:+.0f}", delta_color="inverse")
+        st.metric("Capital next year", f"{nxt['Political Capital']:.0f}", f"{nxt['Political Capital'] - s['Political Capital']:+.0f}")
+    with REGISTRY.span("chart_render"):
+        st.plotly_chart(get_projection_chart(key, projection), use_container_width=True)
+    low, _, median, _, high = projection["score"]
+    st.caption(
+        f"Expected values over random events. If held to 2050: score median {median:.1f} "
+        f"(90% range {low:.1f}–{high:.1f}), chance of breaching 2°C {projection['breach_2c']:.0%}."
+    )
 
-# Sidebar: Controls
-# Sidebar: Controls
-with st.sidebar:
+
+def snapshot_label(timeline, snapshot, on_path):
+    year = timeline.field(snapshot, "year")
+    if snapshot.parent is None:
+        label = f"{year} · start"
+    else:
+        tax, subsidy, regulation = (timeline.field(snapshot, key) for key in ("last_tax", "last_subsidy", "last_regulation"))
+        label = f"{year} · after tax {tax} / subsidy {subsidy} / regulation {regulation}"
+        if timeline.field(snapshot, "game_over"):
+            label += " · final"
+    return label if on_path else f"↪ other branch: {label}"
+
+
+def practice_timeline():
+    # Rewind along this branch, or switch to the end of another one
+    timeline = st.session_state.timeline
+    with st.expander("⏪ Practice Timeline"):
+        path = [snapshot.id for snapshot in reversed(timeline.path())]
+        on_path = set(path)
+        options = path + [tip.id for tip in timeline.tips() if tip.id not in on_path]
+        picked = st.selectbox(
+            "Go to", options,
+            format_func=lambda i: snapshot_label(timeline, timeline.nodes[i], i in on_path)
+        )
+        if st.button("⏪ Go", disabled=picked == timeline.current.id):
+            timeline.restore(picked, st.session_state)
+            get_checkpoint_store().save(st.session_state.team_name, st.session_state)
+            st.session_state.turn_notice = "rewound"
+            st.rerun()
+        st.caption(f"{len(timeline.tips())} branch(es) · {len(timeline)} snapshots. Playing a turn from an earlier year starts a new branch.")
+
+
+@st.fragment
+def policy_controls():
+    started = time.perf_counter()
     st.header("🏛️ Policy Controls")
     st.markdown("Draft your legislation for the upcoming fiscal year.")
 
@@ -485,6 +693,18 @@ with st.sidebar:
         help="Strict rules lower emissions but anger corporations."
     )
 
+    if ADVISOR_ENABLED and not st.session_state.game_over:
+        with st.expander("🧭 Advisor Hint"):
+            if st.checkbox("Show recommended policy"):
+                advice = get_advice(tuple(st.session_state.stats.items()), st.session_state.year)
+                _, hint_tax, hint_subsidy, hint_reg = advice["policies"][0]
+                st.markdown(f"Carbon Tax **{hint_tax}%** · Subsidies **${hint_subsidy}B** · Regulation **{hint_reg}**")
+                st.caption(f"Expected final score if followed to 2050: {advice['score']:.2f}")
+
+    if not st.session_state.game_over:
+        with st.expander("🔮 What-If: Hold This Policy to 2050", expanded=True):
+            show_projection(st.session_state.stats, tax_input, subsidy_input, reg_input)
+
     st.markdown("---")
 
     if st.button("Signed & Sealed ✒️", type="primary"):
@@ -492,106 +712,125 @@ with st.sidebar:
         # 🚫 HARD STOP — Simulation already finished
         if st.session_state.game_over:
             st.warning("Simulation Ended. Please reset.")
-            st.stop()
-
-        # 🧾 Store last policy inputs
-        st.session_state.last_tax = tax_input
-        st.session_state.last_subsidy = subsidy_input
-        st.session_state.last_regulation = reg_input
-
-        # ▶️ Run simulation turn
-        success, msg = calculate_turn(
-            tax_input,
-            subsidy_input,
-            reg_input
-        )
+        else:
+            # 🧾 Store last policy inputs
+            st.session_state.last_tax = tax_input
+            st.session_state.last_subsidy = subsidy_input
+            st.session_state.last_regulation = reg_input
+
+            # ▶️ Run simulation turn
+            with REGISTRY.span("turn"):
+                success, msg = calculate_turn(
+                    tax_input,
+                    subsidy_input,
+                    reg_input
+                )
+
+            if success:
+                if PRACTICE_MODE:
+                    # 🧪 Practice turns are kept on the timeline, not logged
+                    st.session_state.timeline.record(st.session_state)
+                else:
+                    # 📝 Log to Master Sheet (journaled, written in the background)
+                    with REGISTRY.span("journal_write"):
+                        st.session_state.log_ticket = write_to_master_sheet(get_write_queue())
+                with REGISTRY.span("checkpoint_write"):
+                    # Game state only; pickling all of session_state per click costs too much
+                    state_bytes = get_checkpoint_store().save(st.session_state.team_name, st.session_state)
+                REGISTRY.set_gauge("session_state_bytes", state_bytes)
+
+                # The dashboard outside this fragment needs the new year: rerun the app,
+                # and show the outcome there
+                st.session_state.turn_notice = "final" if st.session_state.game_over else (
+                    "practice" if PRACTICE_MODE else "enacted"
+                )
+                REGISTRY.observe("rerun_controls", time.perf_counter() - started)
+                st.rerun()
+            else:
+                st.error(msg)
 
-        if success:
-            # 📝 Log to Master Sheet
-            sheet = get_master_sheet()
-            write_to_master_sheet(sheet)
+    if "log_ticket" in st.session_state:
+        log_status = get_write_queue().status(st.session_state.log_ticket)
+        st.caption(f"📝 Master Sheet log: {log_status}")
 
-
-            # 🏁 Final Year Handling
-            if st.session_state.game_over:
-                st.success("🏁 Final policy enacted. Simulation complete.")
-                st.balloons()
-            else:
-                st.toast("Policy enacted & logged successfully ✅", icon="📊")
-        else:
-            st.error(msg)
+    if PRACTICE_MODE:
+        practice_timeline()
 
     if st.button("Reset Simulation",type="secondary"):
+        get_checkpoint_store().delete(st.session_state.team_name)
         for key in list(st.session_state.keys()):
             del st.session_state[key]
         st.rerun()
 
-# Main Dashboard
-st.title("🌐 UN Sustainability Command Center")
-st.markdown(f"**Current Year: {st.session_state.year}** | Target: Net Zero by 2050")
+    REGISTRY.observe("rerun_controls", time.perf_counter() - started)
 
-# Top Level Metrics
-col1, col2, col3, col4, col5 = st.columns(5)
-s = st.session_state.stats
-with col1: st.metric("GDP", f"${s['GDP (Trillion $)']:.2f} T", delta_color="normal")
-with col2: st.metric("CO2 Output", f"{s['CO2 (Gt)']:.0f} Gt", delta_color="inverse")
-with col3: st.metric("Global Temp", f"+{s['Global Temp Rise']:.2f}°C", delta_color="inverse")
-with col4: st.metric("Political Capital", f"{s['Political Capital']:.0f}", help="Required to pass laws")
-with col5:
-    st.metric("Renewables", f"{s['Renewable %']:.0f}%")
-
-# Approval Bar
-st.write(f"Public Approval Rating: **{s['Public Approval']}%**")
-st.progress(s['Public Approval'] / 100)
-
-# Narrative / Event Box
-if st.session_state.last_event:
-    if "ALERT" in st.session_state.last_event:
-        st.error(f"{st.session_state.last_event} \n\n **Impact:** {st.session_state.event_impact}")
+
+def dashboard_metrics():
+    st.title("🌐 UN Sustainability Command Center")
+    st.markdown(f"**Current Year: {st.session_state.year}** | Target: Net Zero by 2050")
+
+    # Top Level Metrics
+    col1, col2, col3, col4, col5 = st.columns(5)
+    s = st.session_state.stats
+    with col1: st.metric("GDP", f"${s['GDP (Trillion $)']:.2f} T", delta_color="normal")
+    with col2: st.metric("CO2 Output", f"{s['CO2 (Gt)']:.0f} Gt", delta_color="inverse")
+    with col3: st.metric("Global Temp", f"+{s['Global Temp Rise']:.2f}°C", delta_color="inverse")
+    with col4: st.metric("Political Capital", f"{s['Political Capital']:.0f}", help="Required to pass laws")
+    with col5:
+        st.metric("Renewables", f"{s['Renewable %']:.0f}%")
+
+    # Approval Bar
+    st.write(f"Public Approval Rating: **{s['Public Approval']:.0f}%**")
+    st.progress(min(max(s['Public Approval'], 0), 100) / 100)  # events can push approval past 0-100
+
+
+def event_box():
+    # Narrative / Event Box
+    if st.session_state.last_event:
+        if "ALERT" in st.session_state.last_event:
+            st.error(f"{st.session_state.last_event} \n\n **Impact:** {st.session_state.event_impact}")
+        elif st.session_state.event_impact:
+            st.info(f"{st.session_state.last_event} \n\n **Impact:** {st.session_state.event_impact}")
+        else:
+            st.info(st.session_state.last_event)
+
+
+def history_charts():
+    # Charts Area
+    st.markdown("### 📊 Projection Models")
+    tab1, tab2 = st.tabs(["Economic vs Climate", "Energy Mix"])
+
+    if not st.session_state.history.empty:
+        with tab1, REGISTRY.span("chart_render"):
+            st.plotly_chart(get_chart("economy", st.session_state.history), use_container_width=True)
+
+        with tab2, REGISTRY.span("chart_render"):
+            st.plotly_chart(get_chart("energy", st.session_state.history), use_container_width=True)
     else:
-        st.info(st.session_state.last_event)
+        st.info("Awaiting first policy decision to generate projections...")
 
-# Charts Area
-st.markdown("### 📊 Projection Models")
-tab1, tab2 = st.tabs(["Economic vs Climate", "Energy Mix"])
 
-if not st.session_state.history.empty:
-    with tab1:
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=st.session_state.history['Year'], y=st.session_state.history['GDP (Trillion $)'], name='GDP', line=dict(color='#3b82f6', width=3)))
-        fig.add_trace(go.Scatter(x=st.session_state.history['Year'], y=st.session_state.history['CO2 (Gt)'], name='CO2', yaxis='y2', line=dict(color='#ef4444', width=3)))
-        
-        fig.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='white'),
-            yaxis=dict(title='GDP (Trillions)', showgrid=False),
-            yaxis2=dict(title='CO2 (Gt)', overlaying='y', side='right', showgrid=False),
-            margin=dict(l=0, r=0, t=30, b=0),
-            legend=dict(orientation="h", y=1.1)
-        )
-        st.plotly_chart(fig, use_container_width=True)
-
-    with tab2:
-        # Area chart for energy
-        fig2 = go.Figure()
-        hist = st.session_state.history
-        fig2.add_trace(go.Scatter(
-            x=hist['Year'], y=hist['Renewable %'], mode='lines', fill='tozeroy', name='Renewables', line=dict(color='#10b981')
-        ))
-        fig2.add_trace(go.Scatter(
-            x=hist['Year'], y=100-hist['Renewable %'], mode='lines', fill='tonexty', name='Fossil Fuels', line=dict(color='#6b7280')
-        ))
-        fig2.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='white'),
-            yaxis=dict(range=[0, 100], title='Energy Share %'),
-            margin=dict(l=0, r=0, t=30, b=0)
-        )
-        st.plotly_chart(fig2, use_container_width=True)
-else:
-    st.info("Awaiting first policy decision to generate projections...")
+with st.sidebar:
+    policy_controls()
+
+# Outcome of the turn that triggered this rerun
+notice = st.session_state.pop("turn_notice", None)
+if notice == "final":
+    st.success("🏁 Final policy enacted. Simulation complete.")
+    st.balloons()
+elif notice == "enacted":
+    st.toast("Policy enacted ✅ Log queued for the Master Sheet", icon="📊")
+elif notice == "practice":
+    st.toast("Policy enacted ✅ Practice turn, not logged", icon="🧪")
+elif notice == "rewound":
+    st.toast(f"⏪ Back to {st.session_state.year}", icon="🧪")
+
+# Main Dashboard
+dashboard_metrics()
+event_box()
+history_charts()
+
+s = st.session_state.stats
 
 # End Game Logic
 if s['Global Temp Rise'] >= 2.0:
@@ -603,6 +842,8 @@ elif st.session_state.game_over:  # <--- FIXED: using st.session_state.year
     st.balloons()
     st.session_state.game_over = True	
 
+record_rerun()
+
 
 
 
@@ -0,0 +1,278 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from scoring import INITIAL_CO2, INITIAL_GDP, calculate_cumulative_score
+from simulation import (
+    END_YEAR, INITIAL_STATS, START_YEAR,
+    apply_policy, new_event_state, resolve_events, turn_rng
+)
+
+# ----------------------------------------------------
+# HEADLESS BATCH RUNNER
+# ----------------------------------------------------
+# Plays scripted policy schedules without a browser and without importing
+# Streamlit: the turn is the same scalar code the app runs (apply_policy,
+# then the year's event from turn_rng(seed, year)), scored with
+# calculate_cumulative_score after every turn like a logged sheet row.
+#
+# Input is CSV or JSONL (by extension, "-" for JSONL on stdin), one row per
+# team and year: team, year, tax, subsidy, regulation and optionally seed.
+# Rows are grouped per team as they stream in, in any year order; a schedule
+# is played as soon as it has a row for every year (or at the end of the
+# input), so memory stays bounded by the teams still open. A second row for
+# a team's year, or any row for a team already played, is an input error. A
+# team without a seed gets one derived from its name and --seed, so reruns
+# are reproducible.
+#
+# Scripts follow the app's rules, with two fallbacks for gaps in a schedule:
+#   missing       no row for the year: the team does nothing that year
+#   unaffordable  the policy costs more capital than is left: nothing that year
+# A game ends early when warming reaches 2°C (as in the app) or when not even
+# doing nothing is affordable (stalled).
+#
+#   python batch_run.py policies.csv --out turns.jsonl
+#   python batch_run.py submissions.jsonl --summary grades.parquet --workers 8
+
+POLICY_FIELDS = ("tax", "subsidy", "regulation")
+# Stats key -> output column, named like the Master Control sheet
+STAT_COLUMNS = {
+    'GDP (Trillion $)': "GDP_Trillion",
+    'CO2 (Gt)': "CO2_Gt",
+    'Renewable %': "Renewable_Percent",
+    'Public Approval': "Public_Approval",
+    'Political Capital': "Political_Capital",
+    'Global Temp Rise': "Global_Temp_Rise"
+}
+CHUNK = 64   # schedules per pool task
+
+
+def team_seed(team, base_seed=0):
+    # 40 bits, like the app's run_seed
+    return int.from_bytes(hashlib.blake2b(f"{base_seed}:{team}".encode(), digest_size=5).digest(), "big")
+
+
+def read_rows(path):
+    # Raw dicts with their line number
+    if path == "-" or path.endswith((".jsonl", ".json")):
+        f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        with f:
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_no, json.loads(line)
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            # Header is line 1
+            for line_no, row in enumerate(csv.DictReader(f), 2):
+                yield line_no, row
+
+
+def parse_rows(rows):
+    for line_no, row in rows:
+        try:
+            team = str(row["team"]).strip()
+            year = int(float(row["year"]))
+            policy = tuple(int(float(row[field])) for field in POLICY_FIELDS)
+            seed = row.get("seed")
+            seed = int(float(seed)) if seed not in (None, "") else None
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"line {line_no}: {e!r} in {row!r}") from None
+        if not team or not START_YEAR <= year <= END_YEAR:
+            raise ValueError(f"line {line_no}: need a team and a year in {START_YEAR}-{END_YEAR}, got {row!r}")
+        yield line_no, team, year, policy, seed
+
+
+def schedules(rows):
+    # {"team", "seed", "policies": {year: (tax, subsidy, regulation)}} per team
+    turns = END_YEAR - START_YEAR + 1
+    open_teams = {}
+    played = set()
+    for line_no, team, year, policy, seed in rows:
+        if team in played:
+            raise ValueError(f"line {line_no}: team {team!r} already has a row for every year")
+        schedule = open_teams.setdefault(team, {"team": team, "seed": None, "policies": {}})
+        if year in schedule["policies"]:
+            raise ValueError(f"line {line_no}: team {team!r} already has a {year} row")
+        if seed is not None:
+            schedule["seed"] = seed
+        schedule["policies"][year] = policy
+        if len(schedule["policies"]) == turns:
+            played.add(team)
+            yield open_teams.pop(team)
+    yield from open_teams.values()
+
+
+def play(schedule, base_seed=0):
+    # Returns (per-turn records, summary)
+    team = schedule["team"]
+    seed = schedule["seed"] if schedule["seed"] is not None else team_seed(team, base_seed)
+    stats = dict(INITIAL_STATS)
+    event_state = new_event_state()
+    turns = []
+    counts = {"missing": 0, "unaffordable": 0}
+    end = "complete"
+
+    for year in range(START_YEAR, END_YEAR + 1):
+        policy = schedule["policies"].get(year)
+        status = "ok"
+        if policy is None:
+            policy, status = (0, 0, 0), "missing"
+        elif not apply_policy(stats, *policy):
+            policy, status = (0, 0, 0), "unaffordable"
+        if status != "ok":
+            counts[status] += 1
+            if not apply_policy(stats, *policy):
+                end = "stalled"
+                break
+
+        # The final turn draws no event, as in the app
+        event = resolve_events(stats, turn_rng(seed, year), event_state) if year < END_YEAR else None
+        score = calculate_cumulative_score(
+            initial_gdp=INITIAL_GDP, final_gdp=stats['GDP (Trillion $)'],
+            initial_co2=INITIAL_CO2, final_co2=stats['CO2 (Gt)'],
+            final_temp=stats['Global Temp Rise'], political_capital=stats['Political Capital'],
+            renewable_pct=stats['Renewable %'], public_approval=stats['Public Approval']
+        )
+        turns.append({
+            "team": team, "seed": seed, "year": year,
+            **dict(zip(POLICY_FIELDS, policy)), "status": status,
+            **{column: stats[key] for key, column in STAT_COLUMNS.items()},
+            "event": None if event is None else event["name"],
+            "score": score
+        })
+        if stats['Global Temp Rise'] >= 2.0:
+            end = "breach_2c"
+            break
+
+    last = turns[-1] if turns else None
+    summary = {
+        "team": team, "seed": seed, "turns": len(turns),
+        "final_year": last["year"] if last else None, "end": end,
+        **{column: (last[column] if last else INITIAL_STATS[key]) for key, column in STAT_COLUMNS.items()},
+        **counts,
+        "score": last["score"] if last else None
+    }
+    return turns, summary
+
+
+def _play_chunk(args):
+    chunk, base_seed = args
+    return [play(schedule, base_seed) for schedule in chunk]
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(schedule_stream, workers=None, base_seed=0, chunk=CHUNK):
+    # Yields (turns, summary) in input order. At most two chunks per worker are
+    # in flight, so neither input nor results pile up in memory.
+    chunks = _chunks(schedule_stream, chunk)
+    if workers == 1:
+        for part in chunks:
+            yield from _play_chunk((part, base_seed))
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window = deque()
+        for part in chunks:
+            window.append(pool.submit(_play_chunk, (part, base_seed)))
+            if len(window) >= 2 * workers:
+                yield from window.popleft().result()
+        while window:
+            yield from window.popleft().result()
+
+
+class JsonlWriter:
+    def __init__(self, path):
+        self._file = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+
+    def write(self, records):
+        for record in records:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class ParquetWriter:
+    # Buffers records into row groups; pyarrow is only imported for Parquet output
+    def __init__(self, path, row_group=50_000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa, self._pq = pa, pq
+        self.path = path
+        self.row_group = row_group
+        self._buffer = []
+        self._writer = None
+
+    def write(self, records):
+        self._buffer.extend(records)
+        if len(self._buffer) >= self.row_group:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        table = self._pa.Table.from_pylist(self._buffer, schema=self._writer.schema if self._writer else None)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+        self._buffer = []
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_writer(path):
+    return ParquetWriter(path) if path.endswith(".parquet") else JsonlWriter(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play scripted policy schedules headlessly and score them")
+    parser.add_argument("input", help="CSV or JSONL with team, year, tax, subsidy, regulation[, seed]; - for JSONL on stdin")
+    parser.add_argument("--out", help="per-turn results, .jsonl or .parquet (- for stdout)")
+    parser.add_argument("--summary", help="one row per team, .jsonl or .parquet (- for stdout)")
+    parser.add_argument("--seed", type=int, default=0, help="base for seeds of teams that bring none")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument("--chunk", type=int, default=CHUNK, help="schedules per pool task")
+    args = parser.parse_args()
+    if not args.out and not args.summary:
+        parser.error("nothing to write: give --out and/or --summary")
+
+    started = time.perf_counter()
+    turn_writer = open_writer(args.out) if args.out else None
+    summary_writer = open_writer(args.summary) if args.summary else None
+    teams = turns = 0
+    try:
+        stream = schedules(parse_rows(read_rows(args.input)))
+        for team_turns, summary in run(stream, args.workers, args.seed, args.chunk):
+            teams += 1
+            turns += len(team_turns)
+            if turn_writer:
+                turn_writer.write(team_turns)
+            if summary_writer:
+                summary_writer.write([summary])
+    except ValueError as e:
+        sys.exit(f"{args.input}: {e}")
+    finally:
+        for writer in (turn_writer, summary_writer):
+            if writer:
+                writer.close()
+    print(f"{teams} schedules, {turns} turns in {time.perf_counter() - started:.1f}s", file=sys.stderr)
@@ -0,0 +1,253 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import timeit
+
+import numpy as np
+import plotly.io as pio
+
+from charts import build_economy_figure, build_energy_figure, fill_economy_figure, fill_energy_figure
+from regions import RegionalWorld
+from scoring import calculate_cumulative_score, cumulative_scores
+from simulation import (
+    END_YEAR, INITIAL_STATS, START_YEAR,
+    apply_policy, new_event_state, resolve_events, simulate_games
+)
+from turn_history import TurnHistory
+
+# ----------------------------------------------------
+# MICROBENCHMARKS
+# ----------------------------------------------------
+# Fixed-size, seeded workloads for the simulation, scoring and chart hot
+# paths, plus the cold import time of the app's landing and simulation pages
+# (each a fresh interpreter, so they include Python's own startup). Each benchmark reports the median time per call over several
+# repeats. --save records the results as the baseline; later runs print the
+# change against it and, with --check, exit non-zero on a regression.
+#
+#   python benchmarks.py --save      # on main
+#   python benchmarks.py --check     # on your branch, same machine
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BASE_DIR, "bench_baseline.json")
+SEED = 2050
+TURNS = END_YEAR - START_YEAR + 1
+
+# What basetrial2.py imports before the landing page renders, and on top of
+# that for the simulation page (keep in step with its SIMULATION_MODULES)
+LANDING_IMPORTS = ["streamlit", "sheet_backends", "assets", "leaderboard", "metrics"]
+SIMULATION_IMPORTS = LANDING_IMPORTS + [
+    "numpy", "gspread", "google.oauth2.service_account",
+    "simulation", "scoring", "turn_history", "checkpoints", "sheet_queue",
+    "turn_journal", "charts", "solver", "projection", "spectator", "timeline"
+]
+# Must never be loaded just to show the landing page
+HEAVY_MODULES = ["numpy", "pandas", "gspread", "google.auth", "pyarrow"]
+
+
+def _policies(rng, n):
+    # Cheap enough to stay affordable for most of a game
+    return [(rng.randint(0, 4), rng.randint(0, 5), rng.randint(0, 2)) for _ in range(n)]
+
+
+def bench_one_turn():
+    policies = _policies(random.Random(SEED), 1)
+    tax, subsidy, regulation = policies[0]
+
+    def run():
+        apply_policy(dict(INITIAL_STATS), tax, subsidy, regulation)
+    return run
+
+
+def bench_random_event():
+    rng = random.Random(SEED)
+    event_state = new_event_state()
+
+    def run():
+        resolve_events(dict(INITIAL_STATS), rng, event_state)
+    return run
+
+
+def bench_score_one():
+    def run():
+        calculate_cumulative_score(5.0, 6.1, 450, 320.5, 1.45, 72, 48.0, 66)
+    return run
+
+
+def bench_full_game():
+    # One team, 26 scalar turns with events, as the app plays them
+    policies = _policies(random.Random(SEED), TURNS)
+
+    def run():
+        rng = random.Random(SEED)
+        stats = dict(INITIAL_STATS)
+        event_state = new_event_state()
+        for tax, subsidy, regulation in policies:
+            if apply_policy(stats, tax, subsidy, regulation):
+                resolve_events(stats, rng, event_state)
+        calculate_cumulative_score(5.0, stats['GDP (Trillion $)'], 450, stats['CO2 (Gt)'],
+                                   stats['Global Temp Rise'], stats['Political Capital'],
+                                   stats['Renewable %'], stats['Public Approval'])
+    return run
+
+
+def bench_games_10k():
+    rng = np.random.default_rng(SEED)
+    n = 10_000
+    tax = rng.integers(0, 5, (n, TURNS))
+    subsidy = rng.integers(0, 6, (n, TURNS))
+    regulation = rng.integers(0, 3, (n, TURNS))
+
+    def run():
+        simulate_games(tax, subsidy, regulation, rng=np.random.default_rng(SEED))
+    return run
+
+
+def bench_score_100k():
+    rng = np.random.default_rng(SEED)
+    n = 100_000
+    columns = (
+        rng.uniform(4, 9, n), rng.uniform(0, 450, n), rng.uniform(1.1, 2.2, n),
+        rng.integers(0, 150, n), rng.uniform(15, 100, n), rng.integers(0, 100, n)
+    )
+
+    def run():
+        cumulative_scores(*columns)
+    return run
+
+
+def bench_regions_game():
+    # A full seeded game on a 100-region world; a turn should cost about
+    # the same at 10 or 1000 regions
+    def run():
+        world = RegionalWorld.split(100, layout_seed=SEED, seed=SEED)
+        while not world.game_over and world.step(2, 4, 1)[0]:
+            pass
+    return run
+
+
+def bench_history_append():
+    rows = [dict(INITIAL_STATS) for _ in range(TURNS)]
+
+    def run():
+        history = TurnHistory()
+        for year, row in enumerate(rows, START_YEAR):
+            history.append(year, row)
+    return run
+
+
+def bench_figure_build():
+    # Build + fill + serialise, i.e. what a cold chart render costs
+    history = TurnHistory()
+    for year in range(START_YEAR, END_YEAR + 1):
+        history.append(year, INITIAL_STATS)
+
+    def run():
+        for build, fill in ((build_economy_figure, fill_economy_figure), (build_energy_figure, fill_energy_figure)):
+            fig = build()
+            fill(fig, history)
+            pio.to_json(fig, validate=False)
+    return run
+
+
+def _cold_import(modules):
+    command = [sys.executable, "-c", f"import {', '.join(modules)}"]
+
+    def run():
+        subprocess.run(command, cwd=BASE_DIR, check=True)
+    return run
+
+
+def bench_import_landing():
+    check = (
+        f"import sys, {', '.join(LANDING_IMPORTS)}; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    leaked = subprocess.run([sys.executable, "-c", check], cwd=BASE_DIR, check=True,
+                            capture_output=True, text=True).stdout.split()
+    if leaked:
+        raise RuntimeError(f"the landing page now imports {', '.join(leaked)}")
+    return _cold_import(LANDING_IMPORTS)
+
+
+def bench_import_simulation():
+    return _cold_import(SIMULATION_IMPORTS)
+
+
+BENCHMARKS = {
+    "one_turn": bench_one_turn,
+    "random_event": bench_random_event,
+    "score_one": bench_score_one,
+    "full_game": bench_full_game,
+    "games_10k": bench_games_10k,
+    "score_100k": bench_score_100k,
+    "regions_game": bench_regions_game,
+    "history_append": bench_history_append,
+    "figure_build": bench_figure_build,
+    "import_landing": bench_import_landing,
+    "import_simulation": bench_import_simulation,
+}
+
+
+def measure(make, repeats=7):
+    timer = timeit.Timer(make())
+    number, _ = timer.autorange()  # enough calls for ~0.2 s per repeat
+    times = sorted(t / number for t in timer.repeat(repeat=repeats, number=number))
+    return times[len(times) // 2]
+
+
+def run_all(names=None, repeats=7):
+    return {name: measure(BENCHMARKS[name], repeats) for name in (names or BENCHMARKS)}
+
+
+def format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, seconds in results.items():
+        line = f"{name:<16} {format_seconds(seconds):>12}"
+        if name in baseline:
+            delta = (seconds - baseline[name]) / baseline[name] * 100
+            line += f"   {delta:+7.1f}% vs baseline"
+            if delta > threshold:
+                line += "   REGRESSION"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmarks for simulation, scoring and chart hot paths")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if anything regressed past --threshold")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent")
+    parser.add_argument("--repeats", type=int, default=7)
+    args = parser.parse_args()
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    results = run_all(args.names, args.repeats)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({"python": sys.version.split()[0], "machine": platform.machine(), "results": {**baseline, **results}}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    if args.check and regressions:
+        sys.exit(1)
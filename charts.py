@@ -0,0 +1,142 @@
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from simulation import STAT_KEYS
+
+# ----------------------------------------------------
+# DASHBOARD CHARTS
+# ----------------------------------------------------
+# Each figure is built once per session and kept in st.session_state with the
+# history version it was last filled from. Reruns that leave the history
+# alone (slider drags, metric refreshes) reuse the figure as is; a new turn
+# only swaps the trace data in, leaving traces and layout untouched.
+
+CHART_LAYOUT = dict(
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    font=dict(color='white'),
+    margin=dict(l=0, r=0, t=30, b=0)
+)
+
+
+def build_economy_figure():
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(name='GDP', line=dict(color='#3b82f6', width=3)))
+    fig.add_trace(go.Scatter(name='CO2', yaxis='y2', line=dict(color='#ef4444', width=3)))
+    fig.update_layout(
+        **CHART_LAYOUT,
+        yaxis=dict(title='GDP (Trillions)', showgrid=False),
+        yaxis2=dict(title='CO2 (Gt)', overlaying='y', side='right', showgrid=False),
+        legend=dict(orientation="h", y=1.1)
+    )
+    return fig
+
+
+def fill_economy_figure(fig, history):
+    with fig.batch_update():
+        fig.data[0].x = history['Year']
+        fig.data[0].y = history['GDP (Trillion $)']
+        fig.data[1].x = history['Year']
+        fig.data[1].y = history['CO2 (Gt)']
+
+
+def build_energy_figure():
+    # Area chart for energy
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(mode='lines', fill='tozeroy', name='Renewables', line=dict(color='#10b981')))
+    fig.add_trace(go.Scatter(mode='lines', fill='tonexty', name='Fossil Fuels', line=dict(color='#6b7280')))
+    fig.update_layout(
+        **CHART_LAYOUT,
+        yaxis=dict(range=[0, 100], title='Energy Share %')
+    )
+    return fig
+
+
+def fill_energy_figure(fig, history):
+    with fig.batch_update():
+        fig.data[0].x = history['Year']
+        fig.data[0].y = history['Renewable %']
+        fig.data[1].x = history['Year']
+        fig.data[1].y = 100 - history['Renewable %']
+
+
+def build_projection_figure():
+    # Fan chart: 5-95% and 25-75% bands around the median, plus the 2°C limit
+    band = dict(mode='lines', line=dict(width=0), hoverinfo='skip', showlegend=False)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(**band))
+    fig.add_trace(go.Scatter(**band, fill='tonexty', fillcolor='rgba(239,68,68,0.15)', name='5–95%'))
+    fig.add_trace(go.Scatter(**band))
+    fig.add_trace(go.Scatter(**band, fill='tonexty', fillcolor='rgba(239,68,68,0.3)', name='25–75%'))
+    fig.add_trace(go.Scatter(mode='lines', name='Median', line=dict(color='#ef4444', width=3)))
+    fig.add_hline(y=2.0, line=dict(color='#f59e0b', dash='dash'), annotation_text='2°C limit')
+    fig.update_layout(
+        **CHART_LAYOUT,
+        yaxis=dict(title='Global Temp Rise (°C)', showgrid=False),
+        showlegend=False,
+        height=260  # sized for the sidebar
+    )
+    return fig
+
+
+def fill_projection_figure(fig, projection):
+    # projection.project() result; quantiles are (5, 25, 50, 75, 95)
+    temp = projection["quantiles"][:, :, STAT_KEYS.index('Global Temp Rise')]
+    with fig.batch_update():
+        for trace, q in zip(fig.data, (0, 4, 1, 3, 2)):
+            trace.x = projection["years"]
+            trace.y = temp[q]
+
+
+def build_spectator_figure(years, series, label):
+    # Every team's trajectory overlaid (spectator.py). WebGL traces keep the
+    # browser smooth with dozens of teams on a room display.
+    fig = go.Figure()
+    for team, values in series.items():
+        filled = np.flatnonzero(~np.isnan(values))
+        if not len(filled):
+            continue
+        end = filled[-1] + 1
+        fig.add_trace(go.Scattergl(x=years[:end], y=values[:end], mode='lines+markers', name=team,
+                                   marker=dict(size=5), line=dict(width=2)))
+    if label.startswith('Global Temp'):
+        fig.add_hline(y=2.0, line=dict(color='#f59e0b', dash='dash'), annotation_text='2°C limit')
+    fig.update_layout(
+        **CHART_LAYOUT,
+        xaxis=dict(title='Year', showgrid=False),
+        yaxis=dict(title=label, showgrid=False),
+        legend=dict(orientation="v"),
+        height=640  # sized for a projector
+    )
+    return fig
+
+
+CHARTS = {
+    "economy": (build_economy_figure, fill_economy_figure),
+    "energy": (build_energy_figure, fill_energy_figure)
+}
+
+
+def get_chart(name, history):
+    cache = st.session_state.setdefault("chart_cache", {})
+    build, fill = CHARTS[name]
+    version, fig = cache.get(name, (None, None))
+    if fig is None:
+        fig = build()
+    if version != history.version:
+        fill(fig, history)
+        cache[name] = (history.version, fig)
+    return fig
+
+
+def get_projection_chart(key, projection):
+    # Same idea as get_chart, keyed on the projection the figure was filled from
+    cache = st.session_state.setdefault("chart_cache", {})
+    filled_for, fig = cache.get("projection", (None, None))
+    if fig is None:
+        fig = build_projection_figure()
+    if filled_for != key:
+        fill_projection_figure(fig, projection)
+        cache["projection"] = (key, fig)
+    return fig
@@ -0,0 +1,80 @@
+import json
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from simulation import STAT_KEYS
+from turn_history import TurnHistory
+
+# ----------------------------------------------------
+# SESSION CHECKPOINTS
+# ----------------------------------------------------
+# Latest game state per team, saved after every turn so a refresh, dropped
+# websocket or server restart can pick the run up again right after login.
+# One row per team, overwritten in place: the scalar state as JSON and the
+# turn history as raw float64/int64 bytes (a full 26-year game is ~1.5 KB).
+# Restoring is a single primary-key lookup; nothing is replayed and the
+# Master Control sheet is never read.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    team    TEXT PRIMARY KEY,
+    state   TEXT NOT NULL,
+    years   BLOB NOT NULL,
+    history BLOB NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+# session_state keys that make up a run (history is stored separately)
+STATE_KEYS = (
+    "year", "run_id", "run_seed", "stats", "event_state", "game_over", "last_event", "event_impact",
+    "enacted_year", "last_tax", "last_subsidy", "last_regulation", "log_ticket"
+)
+
+
+class CheckpointStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # A checkpoint is replaceable (the journal has the turns), so it only
+        # has to survive a process crash, not a power cut
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def save(self, team, session_state):
+        # Returns the checkpoint's size in bytes (the run's serialised game state)
+        state = json.dumps({key: session_state[key] for key in STATE_KEYS if key in session_state})
+        history = session_state["history"]
+        years = history.years.astype(np.int64).tobytes()
+        values = history.values.astype(np.float64).tobytes()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (team, state, years, history, updated) VALUES (?, ?, ?, ?, ?)",
+                (team, state, years, values, time.time())
+            )
+        return len(state) + len(years) + len(values)
+
+    def load(self, team):
+        # {session_state key: value} including a rebuilt TurnHistory, or None
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT state, years, history FROM checkpoints WHERE team = ?", (team,)
+            ).fetchone()
+        if found is None:
+            return None
+        state, years, values = found
+        restored = json.loads(state)
+        restored["history"] = TurnHistory.from_arrays(
+            np.frombuffer(years, dtype=np.int64),
+            np.frombuffer(values, dtype=np.float64).reshape(-1, len(STAT_KEYS))
+        )
+        return restored
+
+    def delete(self, team):
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE team = ?", (team,))
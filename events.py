@@ -0,0 +1,206 @@
+import operator
+import tomllib
+
+import numpy as np
+
+# ----------------------------------------------------
+# EVENT ENGINE
+# ----------------------------------------------------
+# Events come from a TOML file (events.toml) and are compiled once into
+# arrays: an effect vector per event, four threshold matrices for the
+# conditions (one per operator, +/-inf where a stat is unconstrained) and
+# per-event weights, durations and cooldowns. Each distinct set of eligible
+# events gets a Walker/Vose alias table the first time it comes up, so a
+# pick is O(1) whatever the weights.
+#
+# Per run, the engine tracks two int vectors (one slot per event):
+#   timers  turns until the event may fire again (running + cooldown)
+#   active  turns of effect still to come after the current one
+# Resolving a turn returns the fired event and the total effect of new and
+# ongoing events as one vector, which the caller adds to the stats.
+# resolve() is the one-run path (plain lists, a bitmask for eligibility, no
+# array temporaries); resolve_batch() is the same rule over many runs.
+
+NO_EVENT = -1
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+
+def _alias_table(weights):
+    # Vose's method: (prob, alias) such that picking a column uniformly and
+    # keeping it with probability prob[col] (else alias[col]) samples `weights`
+    n = len(weights)
+    scaled = np.asarray(weights, dtype=float) * n / np.sum(weights)
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1]
+    large = [i for i in range(n) if scaled[i] >= 1]
+    while small and large:
+        s, g = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = g
+        scaled[g] -= 1 - scaled[s]
+        (small if scaled[g] < 1 else large).append(g)
+    return prob, alias
+
+
+class EventTable:
+    def __init__(self, events, trigger_chance, stat_keys):
+        self.events = events
+        self.trigger_chance = float(trigger_chance)
+        self.stat_keys = list(stat_keys)
+        n, k = len(events), len(stat_keys)
+
+        self.names = [event["name"] for event in events]
+        self.effects = np.array([[event["effect"].get(key, 0) for key in stat_keys] for event in events], dtype=float)
+        self.weights = np.array([event.get("weight", 1) for event in events], dtype=float)
+        self.durations = np.array([event.get("duration", 1) for event in events], dtype=int)
+        self.cooldowns = np.array([event.get("cooldown", 0) for event in events], dtype=int)
+
+        # Condition thresholds; a stat with no condition never excludes an event
+        self._gt = np.full((n, k), -np.inf)
+        self._ge = np.full((n, k), -np.inf)
+        self._lt = np.full((n, k), np.inf)
+        self._le = np.full((n, k), np.inf)
+        bounds = dict(zip(OPERATORS, (self._gt, self._ge, self._lt, self._le)))
+        self._conditions = []   # (event bit, stat key, test, value) for resolve()
+        for e, event in enumerate(events):
+            for condition in event.get("conditions", []):
+                if condition["op"] not in bounds:
+                    raise ValueError(f"{event['name']}: unknown operator {condition['op']!r}")
+                if condition["stat"] not in self.stat_keys:
+                    raise ValueError(f"{event['name']}: unknown stat {condition['stat']!r}")
+                matrix = bounds[condition["op"]]
+                j = self.stat_keys.index(condition["stat"])
+                tighter = max if condition["op"] in (">", ">=") else min
+                matrix[e, j] = tighter(matrix[e, j], condition["value"])
+                self._conditions.append((1 << e, condition["stat"], OPERATORS[condition["op"]], condition["value"]))
+
+        self._bits = 1 << np.arange(n)
+        self._all = (1 << n) - 1
+        self._aliases = {}   # eligibility bitmask -> (members, prob, alias), arrays and lists
+
+        # Plain-list copies for resolve()
+        self._rows = self.effects.tolist()
+        self._durations = self.durations.tolist()
+        self._blocks = (self.durations + self.cooldowns).tolist()
+        # One-turn events with no cooldown never need the timers at all
+        self.stateless = bool((self.durations == 1).all() and (self.cooldowns == 0).all())
+
+    @property
+    def mean_effect(self):
+        # Expected effect per turn if every event were always eligible
+        shares = self.weights / self.weights.sum()
+        return self.trigger_chance * (shares * self.durations) @ self.effects
+
+    def new_state(self, n=None):
+        # (timers, active), all zero: nothing running or cooling down
+        shape = (len(self.events),) if n is None else (n, len(self.events))
+        return np.zeros(shape, dtype=int), np.zeros(shape, dtype=int)
+
+    def eligible(self, states, timers):
+        ok = timers == 0
+        if self._conditions:
+            states = states[..., None, :]
+            ok &= (
+                (states > self._gt) & (states >= self._ge) & (states < self._lt) & (states <= self._le)
+            ).all(axis=-1)
+        return ok
+
+    def _alias_for(self, mask):
+        table = self._aliases.get(mask)
+        if table is None:
+            members = np.flatnonzero(mask & self._bits)
+            prob, alias = _alias_table(self.weights[members]) if len(members) else (None, None)
+            lists = (members.tolist(), None, None) if prob is None else (members.tolist(), prob.tolist(), alias.tolist())
+            table = self._aliases[mask] = (members, prob, alias, lists)
+        return table
+
+    def _pick(self, mask, u):
+        members, prob, alias = self._alias_for(mask)[3]
+        if not members:
+            return NO_EVENT
+        x = u * len(members)
+        col = min(int(x), len(members) - 1)
+        return members[col if x - col < prob[col] else alias[col]]
+
+    def resolve(self, stats, timers, active, u_fire, u_pick):
+        # One run, one turn, on a stats dict. `timers` and `active` are lists, updated in place.
+        # Returns (event index or NO_EVENT, total effect as a list, or None if nothing happened)
+        mask = self._all
+        fired = []
+        if not self.stateless:
+            for e, left in enumerate(active):
+                if left:
+                    fired.append(e)
+                    active[e] = left - 1
+            for e, left in enumerate(timers):
+                if left:
+                    timers[e] = left - 1
+                    if left > 1:
+                        mask &= ~(1 << e)
+
+        event = NO_EVENT
+        if u_fire < self.trigger_chance:
+            for bit, key, test, value in self._conditions:
+                if mask & bit and not test(stats[key], value):
+                    mask &= ~bit
+            event = self._pick(mask, u_pick)
+        if event != NO_EVENT:
+            fired.append(event)
+            if not self.stateless:
+                active[event] = self._durations[event] - 1
+                timers[event] = self._blocks[event]
+
+        if not fired:
+            return event, None
+        if len(fired) == 1:
+            return event, self._rows[fired[0]]
+        return event, [sum(column) for column in zip(*(self._rows[e] for e in fired))]
+
+    def resolve_batch(self, states, timers, active, u_fire, u_pick, forced=None):
+        # Many runs, one turn each; `forced` (index per row) skips the draw.
+        # Returns (events, effect rows or None if no run was affected, timers, active).
+        total = None
+        if not self.stateless:
+            timers, active = timers.copy(), active.copy()
+            if active.any():
+                # Effects still running from earlier turns
+                ongoing = active > 0
+                total = ongoing.astype(float) @ self.effects
+                active[ongoing] -= 1
+            np.subtract(timers, 1, out=timers, where=timers > 0)
+
+        if forced is not None:
+            events = np.asarray(forced, dtype=int)
+        else:
+            events = np.full(len(states), NO_EVENT)
+            firing = np.flatnonzero(u_fire < self.trigger_chance)
+            if self._conditions or not self.stateless:
+                masks = self.eligible(states[firing], timers[firing]) @ self._bits
+                groups = [(int(mask), firing[masks == mask]) for mask in np.unique(masks)]
+            else:
+                groups = [(self._all, firing)]
+            for mask, rows in groups:
+                members, prob, alias, _ = self._alias_for(mask)
+                if not len(members):
+                    continue
+                x = u_pick[rows] * len(members)
+                col = np.minimum(x.astype(int), len(members) - 1)
+                events[rows] = members[np.where(x - col < prob[col], col, alias[col])]
+
+        hit = np.flatnonzero(events != NO_EVENT)
+        if len(hit):
+            fired = events[hit]
+            if total is None:
+                total = np.zeros((len(states), self.effects.shape[1]))
+            total[hit] += self.effects[fired]
+            if not self.stateless:
+                active[hit, fired] = self.durations[fired] - 1
+                timers[hit, fired] = self.durations[fired] + self.cooldowns[fired]
+        return events, total, timers, active
+
+
+def load_event_table(path, stat_keys):
+    with open(path, "rb") as f:
+        config = tomllib.load(f)
+    return EventTable(config["events"], config.get("trigger_chance", 0.4), stat_keys)
@@ -0,0 +1,81 @@
+import bisect
+import threading
+import time
+
+from metrics import REGISTRY
+from sheet_backends import SHEET_COLUMNS
+
+# ----------------------------------------------------
+# LEADERBOARD READ MODEL
+# ----------------------------------------------------
+# Process-wide view of the Master Control sheet (see get_leaderboard in
+# basetrial2.py). It remembers how many rows it has already seen and, at most
+# once per TTL, reads only the rows appended since. Each team's latest
+# Cumulative_Score is kept in a sorted index so rank lookups are a bisect.
+
+TEAM_COL = SHEET_COLUMNS.index("Team_Name")
+YEAR_COL = SHEET_COLUMNS.index("Simulation_Year")
+SCORE_COL = SHEET_COLUMNS.index("Cumulative_Score")
+
+
+class LeaderboardModel:
+    def __init__(self, backend, ttl=15, header_rows=1):
+        self.backend = backend
+        self.ttl = ttl
+        self._next_row = header_rows + 1  # first sheet row not read yet (1-based)
+        self._last_fetch = 0.0
+        self._fetch_lock = threading.Lock()  # one sheet read at a time
+        self._lock = threading.Lock()        # guards the index below
+
+        self._latest = {}      # team -> (score, year)
+        self._ranking = []     # sorted (-score, team)
+
+    def _apply(self, row):
+        if len(row) <= SCORE_COL or not row[TEAM_COL]:
+            return
+        try:
+            score = float(row[SCORE_COL])
+            year = int(float(row[YEAR_COL]))
+        except (TypeError, ValueError):
+            return
+        team = str(row[TEAM_COL])
+        if team in self._latest:
+            old_score, _ = self._latest[team]
+            del self._ranking[bisect.bisect_left(self._ranking, (-old_score, team))]
+        self._latest[team] = (score, year)
+        bisect.insort(self._ranking, (-score, team))
+
+    def refresh(self, force=False):
+        # Only one viewer per TTL window pays for a sheet read; the rest see the cached model
+        with self._fetch_lock:
+            if not force and time.monotonic() - self._last_fetch < self.ttl:
+                return False
+            self._last_fetch = time.monotonic()
+            REGISTRY.inc("sheet_api_calls_total")
+            with REGISTRY.span("sheet_read"):
+                rows = self.backend.read_rows(self._next_row)
+            with self._lock:
+                for row in rows:
+                    self._apply(row)
+                self._next_row += len(rows)
+            return bool(rows)
+
+    def rank(self, team):
+        # 1-based rank, or None if the team has not logged a turn yet
+        with self._lock:
+            if team not in self._latest:
+                return None
+            score, _ = self._latest[team]
+            return bisect.bisect_left(self._ranking, (-score, team)) + 1
+
+    def top(self, n=None):
+        with self._lock:
+            entries = self._ranking if n is None else self._ranking[:n]
+            return [
+                {"Rank": i + 1, "Team": team, "Score": -neg_score, "Year": self._latest[team][1]}
+                for i, (neg_score, team) in enumerate(entries)
+            ]
+
+    @property
+    def rows_seen(self):
+        return self._next_row - 1
@@ -0,0 +1,243 @@
+import argparse
+import ast
+import json
+import os
+import pickle
+import random
+import statistics
+import tempfile
+import threading
+import time
+import tomllib
+import tracemalloc
+
+import gspread
+import requests
+from gspread.exceptions import APIError
+from streamlit.testing.v1 import AppTest
+
+from turn_journal import TurnJournal
+
+# ----------------------------------------------------
+# CONCURRENT-SESSION LOAD TEST
+# ----------------------------------------------------
+# Drives N simulated teams through the real basetrial2.py with Streamlit's
+# AppTest: every team logs in, then all of them play turn after turn, with
+# slider moves before each Signed & Sealed. gspread.authorize is swapped for an in-process fake sheet, so
+# open_master_sheet / the write queue run unmodified against something that
+# can be made slow or made to fail with APIError. Half the failed appends
+# fail after the rows landed, like a timeout on a committed write.
+#
+#   python loadtest.py --teams 22 --latency 0.3 --error-rate 0.1
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BASE_DIR, "basetrial2.py")
+SECRETS_PATH = os.path.join(BASE_DIR, ".streamlit", "secrets.toml")
+
+
+def make_api_error(code=429, message="Quota exceeded (load test)"):
+    response = requests.Response()
+    response.status_code = code
+    response._content = json.dumps({"error": {"code": code, "message": message, "status": "RESOURCE_EXHAUSTED"}}).encode()
+    return APIError(response)
+
+
+class FakeWorksheet:
+    # Stand-in for gspread's Worksheet: every call sleeps `latency` seconds and
+    # fails with a 429 APIError with probability `error_rate`.
+    def __init__(self, latency=0.0, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.rows = [["header"]]
+        self.calls = 0
+        self.errors = 0
+
+    def _call(self, landed=None):
+        with self._lock:
+            self.calls += 1
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+                if landed and self._rng.random() < 0.5:
+                    self.rows.extend(landed)
+        time.sleep(self.latency)
+        if fail:
+            raise make_api_error()
+
+    def append_rows(self, rows, value_input_option=None):
+        self._call(landed=rows)
+        with self._lock:
+            self.rows.extend(rows)
+
+    def append_row(self, row, value_input_option=None):
+        self.append_rows([row], value_input_option)
+
+    def get(self, range_name, **options):
+        self._call()
+        start = int("".join(c for c in range_name.split(":")[0] if c.isdigit()))
+        with self._lock:
+            return [list(row) for row in self.rows[start - 1:]]
+
+    def col_values(self, col):
+        self._call()
+        with self._lock:
+            return [row[col - 1] for row in self.rows]
+
+    def batch_update(self, data, value_input_option=None):
+        self._call()
+
+
+class FakeClient:
+    def __init__(self, worksheet):
+        self.sheet1 = worksheet
+
+    def open(self, title):
+        return self
+
+
+def percentiles(samples):
+    if not samples:
+        return {"n": 0}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "n": len(ordered),
+        "p50_ms": round(pick(0.50) * 1000, 1),
+        "p95_ms": round(pick(0.95) * 1000, 1),
+        "p99_ms": round(pick(0.99) * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1)
+    }
+
+
+def load_secrets(data_dir):
+    with open(SECRETS_PATH, "rb") as f:
+        secrets = tomllib.load(f)
+    secrets["storage"] = {"data_dir": data_dir}
+    return secrets
+
+
+def new_session(secrets, timeout):
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    for key, value in secrets.items():
+        at.secrets[key] = value
+    return at
+
+
+def login(team, password, secrets, timeout):
+    at = new_session(secrets, timeout)
+    at.run()
+    at.text_input[0].input(team)
+    at.text_input[1].input(password)
+    at.button[0].click().run()
+    at.run()
+    return at
+
+
+def play_turn(at, rng, slider_moves, click_times, slider_times):
+    for _ in range(slider_moves):
+        started = time.perf_counter()
+        at.slider[rng.randrange(3)].set_value(rng.randint(0, 3)).run()
+        slider_times.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    at.button[0].click().run()
+    click_times.append(time.perf_counter() - started)
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+
+def state_size(at):
+    # Pickled size of what a session keeps between reruns (cached figures excluded)
+    state = {key: value for key, value in at.session_state.to_dict().items() if key != "chart_cache"}
+    return len(pickle.dumps(state))
+
+
+def run(teams=22, turns=26, slider_moves=2, latency=0.0, error_rate=0.0, seed=0, trace_heap=False, timeout=30, drain_timeout=120):
+    credentials = _team_credentials()
+    roster = [list(credentials.items())[i % len(credentials)] for i in range(teams)]
+
+    sheet = FakeWorksheet(latency, error_rate, seed)
+    real_authorize = gspread.authorize
+    gspread.authorize = lambda creds: FakeClient(sheet)
+
+    data_dir = tempfile.mkdtemp(prefix="loadtest-")
+    secrets = load_secrets(data_dir)
+    # tracemalloc slows every rerun down, so heap tracing is opt-in
+    if trace_heap:
+        tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    try:
+        # AppTest sessions are not thread-safe, so the sessions are interleaved
+        # turn by turn on one thread; the shared write queue, journal and caches
+        # see all of them at once, as on the real server.
+        sessions = [login(team, password, secrets, timeout) for team, password in roster]
+        rngs = [random.Random(seed + i) for i in range(teams)]
+        click_times, slider_times = [], []
+        for _ in range(turns):
+            for at, rng in zip(sessions, rngs):
+                if not at.session_state.game_over:
+                    play_turn(at, rng, slider_moves, click_times, slider_times)
+        elapsed = time.perf_counter() - started
+        memory = tracemalloc.get_traced_memory()[0] - baseline
+
+        # How long the shared write queue needs to get every journaled turn into the sheet
+        journal = TurnJournal(os.path.join(data_dir, "turn_journal.sqlite3"))
+        drain_started = time.perf_counter()
+        while journal.pending_count() and time.perf_counter() - drain_started < drain_timeout:
+            time.sleep(0.2)
+        drain = time.perf_counter() - drain_started
+        unsynced = journal.pending_count()
+    finally:
+        if trace_heap:
+            tracemalloc.stop()
+        gspread.authorize = real_authorize
+
+    return {
+        "teams": teams,
+        "wall_s": round(elapsed, 2),
+        "signed_and_sealed": percentiles(click_times),
+        "slider_rerun": percentiles(slider_times),
+        "session_state_bytes_avg": int(statistics.mean(state_size(at) for at in sessions)),
+        "heap_per_session_kb": round(memory / teams / 1024, 1) if trace_heap else None,
+        "sync_drain_s": round(drain, 2),
+        "rows_left_unsynced": unsynced,
+        "sheet_calls": sheet.calls,
+        "sheet_errors_injected": sheet.errors,
+        "sheet_rows_written": len(sheet.rows) - 1,
+        "sheet_duplicate_rows": len(sheet.rows) - len({tuple(row) for row in sheet.rows})
+    }
+
+
+def _team_credentials():
+    # TEAM_CREDENTIALS lives in the Streamlit script; pull it out without executing the page
+    with open(APP_PATH, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "TEAM_CREDENTIALS" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise RuntimeError("TEAM_CREDENTIALS not found in basetrial2.py")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for basetrial2.py")
+    parser.add_argument("--teams", type=int, default=22)
+    parser.add_argument("--turns", type=int, default=26)
+    parser.add_argument("--slider-moves", type=int, default=2, help="slider reruns before each Signed & Sealed")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every fake sheet call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="chance a fake sheet call raises APIError")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-heap", action="store_true", help="report heap growth per session (slower reruns)")
+    args = parser.parse_args()
+
+    report = run(
+        teams=args.teams, turns=args.turns, slider_moves=args.slider_moves,
+        latency=args.latency, error_rate=args.error_rate,
+        seed=args.seed, trace_heap=args.trace_heap
+    )
+    print(json.dumps(report, indent=2))
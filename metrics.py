@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+# ----------------------------------------------------
+# IN-PROCESS METRICS
+# ----------------------------------------------------
+# One registry per process (REGISTRY below), fed from the app script and the
+# background sheet writer alike:
+#   span(name)        timed phase of a rerun; rolling window for percentiles
+#   inc(name, value)  monotonically increasing counter
+#   set_gauge(...)    last value wins
+# render_prometheus() formats everything in the Prometheus text format and
+# FileExporter keeps a copy on disk for a node_exporter textfile collector.
+
+WINDOW = 2000           # samples kept per span for percentiles
+SESSION_IDLE_AFTER = 300  # seconds without a rerun before a session stops counting as active
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans = defaultdict(lambda: deque(maxlen=WINDOW))
+        self._span_totals = defaultdict(lambda: [0, 0.0])  # count, sum of seconds
+        self._counters = defaultdict(float)
+        self._gauges = {}
+        self._sessions = {}   # session id -> last seen (monotonic)
+
+    @contextmanager
+    def span(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def observe(self, name, seconds):
+        with self._lock:
+            self._spans[name].append(seconds)
+            totals = self._span_totals[name]
+            totals[0] += 1
+            totals[1] += seconds
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self._gauges[name] = value
+
+    def touch_session(self, session_id):
+        now = time.monotonic()
+        with self._lock:
+            self._sessions[session_id] = now
+            for sid, seen in list(self._sessions.items()):
+                if now - seen > SESSION_IDLE_AFTER:
+                    del self._sessions[sid]
+            self._gauges["active_sessions"] = len(self._sessions)
+
+    def percentiles(self, qs=(0.5, 0.95, 0.99)):
+        # {span: {"count": n, "p50": seconds, ...}} over the rolling window
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self._spans.items()}
+            totals = {name: tuple(t) for name, t in self._span_totals.items()}
+        table = {}
+        for name, samples in snapshot.items():
+            if not samples:
+                continue
+            row = {"count": totals[name][0]}
+            for q in qs:
+                row[f"p{int(q * 100)}"] = samples[min(len(samples) - 1, int(q * len(samples)))]
+            table[name] = row
+        return table
+
+    def counters(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def gauges(self):
+        with self._lock:
+            return dict(self._gauges)
+
+    def render_prometheus(self, prefix="un_policy_"):
+        lines = []
+        quantiles = self.percentiles()
+        with self._lock:
+            totals = {name: tuple(t) for name, t in self._span_totals.items()}
+        for name, row in sorted(quantiles.items()):
+            metric = f"{prefix}{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for key, value in row.items():
+                if key.startswith("p"):
+                    lines.append(f'{metric}{{quantile="{int(key[1:]) / 100}"}} {value:.6f}')
+            lines.append(f"{metric}_count {totals[name][0]}")
+            lines.append(f"{metric}_sum {totals[name][1]:.6f}")
+        for name, value in sorted(self.counters().items()):
+            lines.append(f"# TYPE {prefix}{name} counter")
+            lines.append(f"{prefix}{name} {value:g}")
+        for name, value in sorted(self.gauges().items()):
+            lines.append(f"# TYPE {prefix}{name} gauge")
+            lines.append(f"{prefix}{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Metrics()
+
+
+class FileExporter:
+    # Rewrites `path` every `interval` seconds (write to temp, then rename,
+    # so a scraper never sees half a file)
+    def __init__(self, path, interval=10, registry=REGISTRY):
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+        self._thread.start()
+
+    def write(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.registry.render_prometheus())
+        os.replace(tmp_path, self.path)
+
+    def _run(self):
+        while True:
+            try:
+                self.write()
+            except OSError:
+                pass
+            time.sleep(self.interval)
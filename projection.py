@@ -0,0 +1,75 @@
+from functools import lru_cache
+
+import numpy as np
+
+from scoring import cumulative_scores
+from simulation import (
+    APPROVAL, CAPITAL, CO2, END_YEAR, GDP, RENEWABLE, STAT_KEYS, TEMP,
+    policy_costs, stats_to_row, step_batch
+)
+
+# ----------------------------------------------------
+# WHAT-IF PROJECTION
+# ----------------------------------------------------
+# Monte Carlo preview of holding one policy from the current state to 2050:
+# SCENARIOS runs through step_batch with random events, summarised as the
+# expected next-year stats and per-year quantile bands for the fan chart.
+# A year the held policy cannot be afforded is played as doing nothing.
+#
+# Results are process-wide and LRU-bounded, keyed on the exact state and
+# policy, so every team dragging sliders over positions already seen (their
+# own or another team's in the same state) gets an instant answer. The seed
+# is fixed, so the fan does not jitter between reruns.
+
+SCENARIOS = 400
+SEED = 2050
+QUANTILES = (5, 25, 50, 75, 95)
+CACHE_SIZE = 2048
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def project(stats_items, timers, active, year, tax, subsidy, regulation):
+    # stats_items: tuple(stats.items()); timers/active: tuples from the run's event_state
+    n = SCENARIOS
+    turns = END_YEAR - year + 1
+    policy = np.array([tax, subsidy, regulation], dtype=float)
+    cost = policy @ policy_costs()
+
+    states = np.tile(stats_to_row(dict(stats_items)), (n, 1))
+    years = np.full(n, year)
+    finished = np.zeros(n, dtype=bool)
+    event_state = (np.tile(timers, (n, 1)), np.tile(active, (n, 1)))
+    rng = np.random.default_rng(SEED)
+    path = np.empty((n, turns, len(STAT_KEYS)))
+
+    for t in range(turns):
+        held = np.where((states[:, CAPITAL] >= cost)[:, None], policy, 0)
+        states, years, _, finished, _, event_state = step_batch(
+            states, years, held[:, 0], held[:, 1], held[:, 2],
+            rng=rng, finished=finished, event_state=event_state
+        )
+        path[:, t] = states
+
+    final_scores = cumulative_scores(
+        states[:, GDP], states[:, CO2], states[:, TEMP],
+        states[:, CAPITAL], states[:, RENEWABLE], states[:, APPROVAL]
+    )
+    result = {
+        "years": np.arange(year, END_YEAR + 1),
+        "next": dict(zip(STAT_KEYS, path[:, 0].mean(axis=0).tolist())),
+        "quantiles": np.percentile(path, QUANTILES, axis=0),   # (len(QUANTILES), turns, stats)
+        "breach_2c": float((path[:, :, TEMP] >= 2.0).any(axis=1).mean()),
+        "score": np.percentile(final_scores, QUANTILES).tolist()
+    }
+    # Shared by every caller with this key, so nobody may modify it
+    for value in result.values():
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    return result
+
+
+def projection_key(stats, event_state, year, tax, subsidy, regulation):
+    return (
+        tuple(stats.items()), tuple(event_state["timers"]), tuple(event_state["active"]),
+        year, tax, subsidy, regulation
+    )
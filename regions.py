@@ -0,0 +1,300 @@
+import itertools
+import random
+
+import numpy as np
+
+from scoring import calculate_cumulative_score, cumulative_scores
+from simulation import (
+    APPROVAL, CAPITAL, CO2, END_YEAR, EVENT_TABLE, EVENTS, GDP, INITIAL_STATS, MODEL_PARAMS,
+    NO_EVENT, RENEWABLE, START_YEAR, STAT_KEYS, TEMP, new_event_state, turn_rng
+)
+
+# ----------------------------------------------------
+# MULTI-REGION WORLD MODEL
+# ----------------------------------------------------
+# The world is split into regions, each with its own GDP, CO2, renewable
+# share and approval. Temperature and Political Capital stay global. State
+# is struct-of-arrays: values[field] is one contiguous (n_regions,) row per
+# REGION_FIELDS entry, so a turn is a fixed number of vector operations
+# whatever the number of regions. The turn follows apply_policy with the
+# same MODEL_PARAMS:
+#
+#   policy      one level for every region, or an (n,) array per lever.
+#               The cost is the weight-averaged cost, paid from the global
+#               capital. Each region's CO2 cut is scaled by its weight.
+#   warming     driven by total CO2 against co2_threshold
+#   events      global events (events.toml) fire on the aggregate stats. GDP
+#               and CO2 effects are shared out in proportion to each
+#               region's current amount. Renewable and approval effects
+#               hit every region. Temperature and capital effects are
+#               global.
+#   trade shock with TRADE_SHOCK["chance"] per turn, one region's economy
+#               contracts and the shock spreads to its trading partners
+#               through the exposure matrix
+#
+# Aggregates: GDP and CO2 are summed; renewables and approval are averaged
+# by region weight. A one-region world with weight 1 and no trade shocks
+# therefore plays exactly like the single global stats dict.
+
+REGION_FIELDS = ["gdp", "co2", "renewable", "approval"]
+R_GDP, R_CO2, R_RENEWABLE, R_APPROVAL = range(len(REGION_FIELDS))
+# Fields whose world value is the sum over regions (the rest are weighted means)
+SUMMED_FIELDS = {"gdp", "co2"}
+
+TRADE_SHOCK = {
+    "chance": 0.1,      # per turn
+    "gdp_loss": 0.03,   # share of GDP lost in the origin region
+    "approval": -3      # approval change in the origin region
+}
+TRADE_OPENNESS = 0.3    # partners' total exposure to a shock, relative to the origin
+
+
+def gravity_exposure(gdp, openness=TRADE_OPENNESS):
+    # exposure[i, j]: share of a shock in region j felt by region i. Each region
+    # trades with the others in proportion to their GDP; the origin feels it in full.
+    n = len(gdp)
+    trade = np.tile(np.asarray(gdp, dtype=float), (n, 1))
+    np.fill_diagonal(trade, 0)
+    totals = trade.sum(axis=1, keepdims=True)
+    trade = np.divide(trade, totals, out=np.zeros_like(trade), where=totals > 0) * openness
+    np.fill_diagonal(trade, 1)
+    return trade
+
+
+class RegionalWorld:
+    def __init__(self, names, gdp, co2, renewable, approval, weights=None, exposure=None,
+                 temp=INITIAL_STATS['Global Temp Rise'], capital=INITIAL_STATS['Political Capital'],
+                 trade_shock=None, seed=None, year=START_YEAR):
+        n = len(names)
+        self.names = list(names)
+        self.values = np.empty((len(REGION_FIELDS), n))
+        for i, field in enumerate((gdp, co2, renewable, approval)):
+            self.values[i] = field
+        weights = np.ones(n) if weights is None else np.asarray(weights, dtype=float)
+        self.weights = weights / weights.sum()
+        self.exposure = gravity_exposure(self.values[R_GDP]) if exposure is None else np.asarray(exposure, dtype=float)
+        self.trade_shock = TRADE_SHOCK if trade_shock is None else {**TRADE_SHOCK, **trade_shock}
+
+        self.temp = float(temp)
+        self.capital = float(capital)
+        self.year = year
+        self.seed = seed   # seeds each turn's draws like the app's run_seed; None for fresh ones
+        self.game_over = False
+        self.event_state = new_event_state()
+        self.last_event = None
+        self.last_shock = None
+        self.initial = self.values.copy()   # the baseline region scores are measured against
+        self.history = RegionHistory(self.names, self.weights)
+
+    @classmethod
+    def split(cls, n, layout_seed=None, **kwargs):
+        # INITIAL_STATS shared out over n regions with random GDP, CO2 and
+        # weight shares, so the aggregates start where the global game does
+        rng = np.random.default_rng(layout_seed)
+        gdp_share, co2_share, weights = rng.dirichlet(np.full(n, 2.0), size=3)
+        return cls(
+            [f"Region {i + 1}" for i in range(n)],
+            gdp=INITIAL_STATS['GDP (Trillion $)'] * gdp_share,
+            co2=INITIAL_STATS['CO2 (Gt)'] * co2_share,
+            renewable=np.full(n, INITIAL_STATS['Renewable %'], dtype=float),
+            approval=np.full(n, INITIAL_STATS['Public Approval'], dtype=float),
+            weights=weights, **kwargs
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def field(self, name):
+        # (n_regions,) view, no copy
+        return self.values[REGION_FIELDS.index(name)]
+
+    def aggregate(self, name):
+        row = self.field(name)
+        return float(row.sum()) if name in SUMMED_FIELDS else float(self.weights @ row)
+
+    def stats(self):
+        # The world as one global stats dict (STAT_KEYS), e.g. for the dashboard or event conditions
+        return {
+            'GDP (Trillion $)': self.aggregate("gdp"),
+            'CO2 (Gt)': self.aggregate("co2"),
+            'Global Temp Rise': self.temp,
+            'Public Approval': self.aggregate("approval"),
+            'Political Capital': self.capital,
+            'Renewable %': self.aggregate("renewable")
+        }
+
+    def apply_policy(self, tax, subsidy, regulation, params=None):
+        # Vector twin of simulation.apply_policy; False, leaving the world untouched, if unaffordable
+        p = MODEL_PARAMS if params is None else params
+        n = len(self)
+        tax = np.broadcast_to(np.asarray(tax, dtype=float), (n,))
+        subsidy = np.broadcast_to(np.asarray(subsidy, dtype=float), (n,))
+        regulation = np.broadcast_to(np.asarray(regulation, dtype=float), (n,))
+
+        # 1. Costs (Political Capital)
+        cost = float(self.weights @ ((tax * p["tax_cost"]) + (subsidy * p["subsidy_cost"]) + (regulation * p["regulation_cost"])))
+        if self.capital < cost:
+            return False
+
+        # 2. Update Stats
+        self.capital -= cost
+        self.capital += p["capital_regen"]
+        gdp, co2, renewable, approval = self.values
+
+        # Economics
+        gdp_growth = p["base_growth"] - (tax * p["tax_drag"]) - (regulation * p["regulation_drag"]) + (subsidy * p["subsidy_boost"])
+        gdp *= (1 + gdp_growth)
+
+        # Environment
+        co2 -= ((tax * p["tax_co2"]) + (subsidy * p["subsidy_co2"]) + (regulation * p["regulation_co2"])) * self.weights
+        renewable += (subsidy * p["subsidy_renewable"])
+
+        # Feedback Loops (global)
+        self.temp += p["warming_high"] if co2.sum() > p["co2_threshold"] else p["warming_low"]
+
+        # Public Opinion
+        approval += (
+            np.where(gdp_growth < 0, p["recession_approval"], 0)
+            + (p["heat_approval"] if self.temp > p["heat_threshold"] else 0)
+            + np.where(subsidy > p["subsidy_approval_level"], p["subsidy_approval"], 0)
+        )
+        np.clip(approval, 0, 100, out=approval)
+
+        # Clamp values
+        np.minimum(renewable, 100, out=renewable)
+        np.maximum(co2, 0, out=co2)
+        return True
+
+    def resolve_events(self, rng):
+        # Global event on the aggregate stats, then the trade shock. Uses four
+        # draws from `rng`; the first two are the ones simulation.resolve_events takes.
+        event, total = EVENT_TABLE.resolve(
+            self.stats(), self.event_state["timers"], self.event_state["active"], rng.random(), rng.random()
+        )
+        if total is not None:
+            gdp, co2, renewable, approval = self.values
+            for column, amount in ((gdp, total[GDP]), (co2, total[CO2])):
+                if amount:
+                    world = column.sum()
+                    # Shared out by current amount; evenly if the world total is zero
+                    column += amount * (column / world if world else self.weights)
+            if total[RENEWABLE]:
+                renewable += total[RENEWABLE]
+            if total[APPROVAL]:
+                approval += total[APPROVAL]
+            self.temp += total[TEMP]
+            self.capital += total[CAPITAL]
+        self.last_event = None if event == NO_EVENT else EVENTS[event]
+
+        u_shock, u_origin = rng.random(), rng.random()
+        self.last_shock = None
+        if u_shock < self.trade_shock["chance"]:
+            origin = min(int(u_origin * len(self)), len(self) - 1)
+            hit = self.exposure[:, origin]
+            self.values[R_GDP] *= 1 - self.trade_shock["gdp_loss"] * hit
+            self.values[R_APPROVAL] += self.trade_shock["approval"] * hit
+            self.last_shock = origin
+        return self.last_event
+
+    def step(self, tax, subsidy, regulation, rng=None, params=None):
+        # One turn, as calculate_turn plays it: (ok, message)
+        if self.game_over:
+            return False, "Simulation complete."
+        if not self.apply_policy(tax, subsidy, regulation, params):
+            return False, "Not enough Political Capital! Lower your intensity."
+        enacted_year = self.year
+        self.history.append(enacted_year, self)
+        if enacted_year >= END_YEAR:
+            self.game_over = True
+            return True, "Final policy enacted. Simulation complete."
+        self.year += 1
+        if rng is None:
+            rng = random.Random() if self.seed is None else turn_rng(self.seed, enacted_year)
+        self.resolve_events(rng)
+        return True, "Policy Enacted Successfully"
+
+    def score(self):
+        # The logged Cumulative_Score, on the world aggregates against the starting world
+        s = self.stats()
+        return calculate_cumulative_score(
+            initial_gdp=float(self.initial[R_GDP].sum()), final_gdp=s['GDP (Trillion $)'],
+            initial_co2=float(self.initial[R_CO2].sum()), final_co2=s['CO2 (Gt)'],
+            final_temp=s['Global Temp Rise'], political_capital=s['Political Capital'],
+            renewable_pct=s['Renewable %'], public_approval=s['Public Approval']
+        )
+
+    def region_scores(self, **kwargs):
+        # Same formula per region, each against its own starting GDP and CO2
+        gdp, co2, renewable, approval = self.values
+        return cumulative_scores(
+            gdp, co2, self.temp, self.capital, renewable, approval,
+            initial_gdp=self.initial[R_GDP], initial_co2=self.initial[R_CO2], **kwargs
+        )
+
+
+# ----------------------------------------------------
+# REGION HISTORY
+# ----------------------------------------------------
+# TurnHistory for a RegionalWorld: one (turns, fields, regions) block sized
+# for the whole game, plus the global temperature and capital. Everything
+# handed out is a view of the filled part.
+
+_versions = itertools.count(1)
+
+
+class RegionHistory:
+    def __init__(self, names, weights, capacity=END_YEAR - START_YEAR + 1):
+        self.names = list(names)
+        self.weights = weights
+        self._years = np.zeros(capacity, dtype=int)
+        self._values = np.zeros((capacity, len(REGION_FIELDS), len(self.names)))
+        self._globals = np.zeros((capacity, 2))   # temp, capital
+        self._size = 0
+        self.version = next(_versions)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def empty(self):
+        return self._size == 0
+
+    def append(self, year, world):
+        if self._size == len(self._years):
+            self._years = np.resize(self._years, 2 * len(self._years))
+            self._values = np.resize(self._values, (2 * len(self._values), *self._values.shape[1:]))
+            self._globals = np.resize(self._globals, (2 * len(self._globals), 2))
+        self._years[self._size] = year
+        self._values[self._size] = world.values
+        self._globals[self._size] = world.temp, world.capital
+        self._size += 1
+        self.version = next(_versions)
+
+    @property
+    def years(self):
+        return self._years[:self._size]
+
+    def column(self, name):
+        # (turns, n_regions) view of one field
+        return self._values[:self._size, REGION_FIELDS.index(name)]
+
+    def region(self, index):
+        # (turns, len(REGION_FIELDS)) view of one region
+        return self._values[:self._size, :, index]
+
+    def aggregate(self, name):
+        # World value per turn, as RegionalWorld.aggregate
+        if name == 'Global Temp Rise':
+            return self._globals[:self._size, 0]
+        if name == 'Political Capital':
+            return self._globals[:self._size, 1]
+        column = self.column(name)
+        return column.sum(axis=1) if name in SUMMED_FIELDS else column @ self.weights
+
+    def stats_values(self):
+        # (turns, len(STAT_KEYS)) world stats, the shape TurnHistory.values has
+        fields = {GDP: "gdp", CO2: "co2", APPROVAL: "approval", RENEWABLE: "renewable"}
+        out = np.empty((self._size, len(STAT_KEYS)))
+        for i, key in enumerate(STAT_KEYS):
+            out[:, i] = self.aggregate(fields.get(i, key))
+        return out
@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from scoring import INITIAL_CO2, INITIAL_GDP, calculate_cumulative_score
+from sheet_backends import SHEET_COLUMNS, CsvSheetBackend, sheet_backend_from_secrets
+from simulation import (
+    END_YEAR, INITIAL_STATS, START_YEAR,
+    apply_policy, event_message, new_event_state, resolve_events, turn_rng
+)
+
+# ----------------------------------------------------
+# RUN REPLAY AND VERIFICATION
+# ----------------------------------------------------
+# Every logged row carries its run's Run_Seed, and each turn's random event
+# comes from turn_rng(seed, year). Starting from INITIAL_STATS, a run can
+# therefore be rebuilt from its logged tax/subsidy/regulation inputs alone.
+# replay_run does that with the app's own scalar turn code, checking every
+# logged stat, the event narrative and Cumulative_Score on the way. Runs
+# (team + seed) are independent, so verify() spreads them over a process pool.
+#
+#   python replay.py                     # Google Sheet from .streamlit/secrets.toml
+#   python replay.py --csv data/log.csv  # offline CSV stand-in
+
+COL = {name: i for i, name in enumerate(SHEET_COLUMNS)}
+
+# Sheet column -> (stats key, decimals it was rounded to when logged)
+LOGGED_STATS = {
+    "GDP_Trillion": ('GDP (Trillion $)', 2),
+    "CO2_Gt": ('CO2 (Gt)', 2),
+    "Renewable_Percent": ('Renewable %', 2),
+    "Public_Approval": ('Public Approval', None),
+    "Political_Capital": ('Political Capital', None),
+    "Global_Temp_Rise": ('Global Temp Rise', 2),
+    "Cumulative_Score": (None, None)
+}
+TOLERANCE = 1e-6
+
+
+def group_runs(rows):
+    # {(team, seed): {year: row}}; rows logged before seeds existed are counted, not replayed
+    runs = defaultdict(dict)
+    unseeded = 0
+    for row in rows:
+        row = list(row) + [""] * (len(SHEET_COLUMNS) - len(row))
+        try:
+            seed = int(float(row[COL["Run_Seed"]]))
+            year = int(float(row[COL["Simulation_Year"]]))
+        except (TypeError, ValueError):
+            unseeded += 1
+            continue
+        # A row re-sent after a lost acknowledgement appears twice; keep the first
+        runs[(str(row[COL["Team_Name"]]), seed)].setdefault(year, row)
+    return runs, unseeded
+
+
+def _mismatch(team, seed, year, field, logged, expected):
+    return {"team": team, "seed": seed, "year": year, "field": field, "logged": logged, "expected": expected}
+
+
+def replay_run(team, seed, rows_by_year):
+    # Returns the list of mismatches (empty when the run checks out)
+    stats = dict(INITIAL_STATS)
+    event_state = new_event_state()
+    event_text = None
+    for year in range(START_YEAR, max(rows_by_year) + 1):
+        row = rows_by_year.get(year)
+        if row is None:
+            return [_mismatch(team, seed, year, "row", None, "missing turn")]
+        try:
+            tax, subsidy, regulation = (int(float(row[COL[c]])) for c in ("Carbon_Tax", "Green_Subsidy", "Regulation_Level"))
+        except (TypeError, ValueError):
+            return [_mismatch(team, seed, year, "policy", row[COL["Carbon_Tax"]:COL["Regulation_Level"] + 1], "numbers")]
+
+        if not apply_policy(stats, tax, subsidy, regulation):
+            return [_mismatch(team, seed, year, "policy", [tax, subsidy, regulation], "affordable policy")]
+        # The final turn draws no event, so the 2050 row repeats the previous narrative
+        if year < END_YEAR:
+            event_text = event_message(resolve_events(stats, turn_rng(seed, year), event_state))
+
+        problems = []
+        score = calculate_cumulative_score(
+            initial_gdp=INITIAL_GDP, final_gdp=stats['GDP (Trillion $)'],
+            initial_co2=INITIAL_CO2, final_co2=stats['CO2 (Gt)'],
+            final_temp=stats['Global Temp Rise'], political_capital=stats['Political Capital'],
+            renewable_pct=stats['Renewable %'], public_approval=stats['Public Approval']
+        )
+        for column, (key, ndigits) in LOGGED_STATS.items():
+            expected = score if key is None else stats[key]
+            if ndigits is not None:
+                expected = round(expected, ndigits)
+            try:
+                logged = float(row[COL[column]])
+            except (TypeError, ValueError):
+                logged = row[COL[column]]
+            if not isinstance(logged, float) or abs(logged - expected) > TOLERANCE:
+                problems.append(_mismatch(team, seed, year, column, logged, expected))
+        if event_text is not None and row[COL["Event_Name"]] != event_text:
+            problems.append(_mismatch(team, seed, year, "Event_Name", row[COL["Event_Name"]], event_text))
+        if problems:
+            # Later turns build on this one, so stop at the first divergence
+            return problems
+    return []
+
+
+def _replay_chunk(runs):
+    return [(len(rows_by_year), replay_run(team, seed, rows_by_year)) for (team, seed), rows_by_year in runs]
+
+
+def verify(rows, workers=None):
+    started = time.perf_counter()
+    runs, unseeded = group_runs(rows)
+    items = list(runs.items())
+
+    if workers == 1 or len(items) < 2:
+        results = _replay_chunk(items)
+    else:
+        workers = workers or os.cpu_count() or 1
+        # A few chunks per worker keeps the pool busy without pickling every run separately
+        size = max(1, len(items) // (workers * 4))
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = [result for chunk in pool.map(_replay_chunk, chunks) for result in chunk]
+
+    mismatches = [problem for _, problems in results for problem in problems]
+    return {
+        "runs": len(items),
+        "turns": sum(turns for turns, _ in results),
+        "runs_verified": sum(1 for _, problems in results if not problems),
+        "rows_without_seed": unseeded,
+        "mismatches": mismatches,
+        "seconds": round(time.perf_counter() - started, 3)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay every logged run from its seed and verify the sheet")
+    parser.add_argument("--csv", help="read this CSV stand-in instead of the Google Sheet")
+    parser.add_argument("--workers", type=int, default=None, help="replay processes (default: one per core)")
+    args = parser.parse_args()
+
+    backend = CsvSheetBackend(args.csv) if args.csv else sheet_backend_from_secrets()
+    report = verify(backend.read_rows(2), args.workers)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if report["mismatches"]:
+        sys.exit(1)
@@ -0,0 +1,82 @@
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+# ----------------------------------------------------
+# MULTI-REPLICA LAUNCHER
+# ----------------------------------------------------
+# Starts N Streamlit servers for basetrial2.py on consecutive ports, all on
+# this host and all sharing one data directory ([storage] data_dir, ./data by
+# default). Team checkpoints and the turn journal are SQLite (WAL) files in
+# that directory, so any replica can resume any team after login; exactly one
+# replica at a time holds data/sheet_writer.lock and pushes journaled rows to
+# the Master Control sheet.
+#
+# Put a load balancer in front. A Streamlit session lives on one websocket,
+# so route each client to a stable replica, e.g. nginx:
+#
+#   upstream un_policy { ip_hash; server 127.0.0.1:8501; server 127.0.0.1:8502; ... }
+#   location / {
+#       proxy_pass http://un_policy;
+#       proxy_http_version 1.1;
+#       proxy_set_header Upgrade $http_upgrade;
+#       proxy_set_header Connection "upgrade";
+#   }
+#
+#   python replicas.py --workers 4 --base-port 8501
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BASE_DIR, "basetrial2.py")
+
+
+def start_replica(replica, port, extra_args):
+    env = dict(os.environ, UN_POLICY_REPLICA=str(replica))
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP_PATH,
+            "--server.port", str(port),
+            "--server.headless", "true",
+            *extra_args
+        ],
+        cwd=BASE_DIR, env=env
+    )
+
+
+def main(workers, base_port, extra_args):
+    processes = {}
+    for replica in range(workers):
+        processes[replica] = start_replica(replica, base_port + replica, extra_args)
+        print(f"replica {replica}: http://localhost:{base_port + replica}")
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    # Restart any replica that dies; its sessions resume from checkpoints on the next login
+    while not stopping:
+        time.sleep(1)
+        for replica, process in processes.items():
+            if process.poll() is not None and not stopping:
+                print(f"replica {replica} exited with {process.returncode}, restarting")
+                processes[replica] = start_replica(replica, base_port + replica, extra_args)
+
+    for process in processes.values():
+        process.terminate()
+    for process in processes.values():
+        process.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run several basetrial2.py replicas sharing one data directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--base-port", type=int, default=8501)
+    args, extra = parser.parse_known_args()
+    main(args.workers, args.base_port, extra)
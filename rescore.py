@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from scoring import cumulative_scores
+from sheet_backends import SHEET_COLUMNS
+
+# ----------------------------------------------------
+# BULK RE-SCORING
+# ----------------------------------------------------
+# Recomputes Cumulative_Score for every logged row in one vectorised pass
+# (scoring.cumulative_scores for plain arrays, score_frame for DataFrames),
+# e.g. after the weights or temperature bands change, and writes the column
+# back to the sheet in a single ranged update.
+
+# Sheet column -> cumulative_scores argument
+SCORE_INPUTS = {
+    "GDP_Trillion": "final_gdp",
+    "CO2_Gt": "final_co2",
+    "Global_Temp_Rise": "final_temp",
+    "Political_Capital": "political_capital",
+    "Renewable_Percent": "renewable_pct",
+    "Public_Approval": "public_approval"
+}
+
+
+def score_frame(frame, weights=None, temp_bands=None):
+    # Works on sheet-shaped frames; cells that arrive as strings are coerced once
+    inputs = {
+        arg: pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=float)
+        for column, arg in SCORE_INPUTS.items()
+    }
+    scores = cumulative_scores(**inputs, weights=weights, temp_bands=temp_bands)
+    return pd.Series(scores, index=frame.index, name="Cumulative_Score")
+
+
+def rescore_sheet(backend, weights=None, temp_bands=None, header_rows=1):
+    # Returns the number of rows re-scored
+    rows = backend.read_rows(header_rows + 1)
+    if not rows:
+        return 0
+    width = len(SHEET_COLUMNS)
+    frame = pd.DataFrame([row[:width] + [""] * (width - len(row)) for row in rows], columns=SHEET_COLUMNS)
+    scores = score_frame(frame, weights, temp_bands)
+    # Rows that could not be parsed keep whatever score they already had
+    values = [
+        old if np.isnan(score) else float(score)
+        for score, old in zip(scores, frame["Cumulative_Score"])
+    ]
+    backend.update_column("Cumulative_Score", header_rows + 1, values)
+    return int(np.count_nonzero(~np.isnan(scores.to_numpy())))
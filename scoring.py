@@ -0,0 +1,161 @@
+import numpy as np
+
+# ----------------------------------------------------
+# CUMULATIVE SCORE
+# ----------------------------------------------------
+# Logged as Cumulative_Score on every Master Control row. The scalar version
+# is what the app uses per turn; cumulative_scores is the same formula over
+# whole arrays for the solver and bulk tools.
+
+INITIAL_GDP = 5.0   # Starting GDP
+INITIAL_CO2 = 450   # Starting CO2
+
+# Component weights and temperature bands. Re-scoring tools pass their own
+# versions of these to cumulative_scores when the rules are rebalanced.
+SCORE_WEIGHTS = {
+    "political": 0.15,
+    "gdp": 0.25,
+    "carbon": 0.20,
+    "temperature": 0.20,
+    "renewable": 0.13,
+    "approval": 0.07
+}
+# (upper limit in °C, score), checked in order; anything hotter scores 0
+TEMP_BANDS = [(1.3, 100), (1.5, 80), (1.7, 40)]
+
+
+def clamp(value, min_val, max_val):
+    return max(min_val, min(value, max_val))
+
+
+def calculate_cumulative_score(
+    initial_gdp,
+    final_gdp,
+    initial_co2,
+    final_co2,
+    final_temp,
+    political_capital,
+    renewable_pct,
+    public_approval
+):
+    # 1. Political Capital (25%)
+    political_score = clamp(political_capital, 0, 100)
+    political_component = SCORE_WEIGHTS["political"] * political_score
+
+    # 2. GDP Stability (20%)
+    if initial_gdp > 0:
+        gdp_growth_pct = ((final_gdp - initial_gdp) / initial_gdp) * 100
+    else:
+        gdp_growth_pct = 0  # safety fallback
+
+    gdp_score = clamp(50 + gdp_growth_pct, 0, 100)
+    gdp_component = SCORE_WEIGHTS["gdp"] * gdp_score
+
+    # 3. Carbon Reduction (20%)
+    if initial_co2 > 0:
+        carbon_reduction_pct = ((initial_co2 - final_co2) / initial_co2) * 100
+    else:
+        carbon_reduction_pct = 0  # safety fallback
+
+    carbon_score = clamp(carbon_reduction_pct, 0, 100)
+    carbon_component = SCORE_WEIGHTS["carbon"] * carbon_score
+
+    # 4. Temperature Control (20%)
+    temp_score = 0
+    for limit, band_score in TEMP_BANDS:
+        if final_temp <= limit:
+            temp_score = band_score
+            break
+
+    temp_component = SCORE_WEIGHTS["temperature"] * temp_score
+
+    # 5. Renewable Energy (10%)
+    renewable_score = clamp(renewable_pct, 0, 100)
+    renewable_component = SCORE_WEIGHTS["renewable"] * renewable_score
+
+    # 6. Public Approval (5%)
+    approval_score = clamp(public_approval, 0, 100)
+    approval_component = SCORE_WEIGHTS["approval"] * approval_score
+
+    final_score = (
+        political_component +
+        gdp_component +
+        carbon_component +
+        temp_component +
+        renewable_component +
+        approval_component
+    )
+
+    return round(final_score, 2)
+
+
+def round_like_python(values, ndigits=2):
+    # np.round scales by 10**ndigits first, which can tip exact halves the
+    # other way from round(). Rows that land within a hair of a half are
+    # re-rounded with round() so results match calculate_cumulative_score.
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, ndigits)
+    scaled = values * 10 ** ndigits
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_half):
+        rounded.flat[i] = round(float(values.flat[i]), ndigits)
+    return rounded
+
+
+def cumulative_scores(
+    final_gdp,
+    final_co2,
+    final_temp,
+    political_capital,
+    renewable_pct,
+    public_approval,
+    initial_gdp=INITIAL_GDP,
+    initial_co2=INITIAL_CO2,
+    weights=None,
+    temp_bands=None,
+    rounded=True
+):
+    weights = SCORE_WEIGHTS if weights is None else {**SCORE_WEIGHTS, **weights}
+    temp_bands = TEMP_BANDS if temp_bands is None else temp_bands
+
+    final_gdp = np.asarray(final_gdp, dtype=float)
+    final_co2 = np.asarray(final_co2, dtype=float)
+    final_temp = np.asarray(final_temp, dtype=float)
+    initial_gdp = np.asarray(initial_gdp, dtype=float)
+    initial_co2 = np.asarray(initial_co2, dtype=float)
+
+    # 1. Political Capital
+    political_component = weights["political"] * np.clip(political_capital, 0, 100)
+
+    # 2. GDP Stability
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gdp_growth_pct = np.where(initial_gdp > 0, ((final_gdp - initial_gdp) / initial_gdp) * 100, 0)
+        carbon_reduction_pct = np.where(initial_co2 > 0, ((initial_co2 - final_co2) / initial_co2) * 100, 0)
+    gdp_component = weights["gdp"] * np.clip(50 + gdp_growth_pct, 0, 100)
+
+    # 3. Carbon Reduction
+    carbon_component = weights["carbon"] * np.clip(carbon_reduction_pct, 0, 100)
+
+    # 4. Temperature Control
+    temp_score = np.select(
+        [final_temp <= limit for limit, _ in temp_bands],
+        [band_score for _, band_score in temp_bands],
+        0
+    )
+    temp_component = weights["temperature"] * temp_score
+
+    # 5. Renewable Energy
+    renewable_component = weights["renewable"] * np.clip(renewable_pct, 0, 100)
+
+    # 6. Public Approval
+    approval_component = weights["approval"] * np.clip(public_approval, 0, 100)
+
+    final_score = (
+        political_component +
+        gdp_component +
+        carbon_component +
+        temp_component +
+        renewable_component +
+        approval_component
+    )
+    return round_like_python(final_score) if rounded else final_score
@@ -0,0 +1,168 @@
+import csv
+import os
+import threading
+import tomllib
+
+# ----------------------------------------------------
+# SHEET BACKENDS
+# ----------------------------------------------------
+# Everything that talks to the Master Control sheet goes through one of
+# these. GspreadBackend is the real Google Sheet; CsvSheetBackend is a local
+# file-based stand-in with the same methods, for tests and offline runs.
+# Row numbers are 1-based and row 1 is the header, as in the sheet.
+
+SHEET_COLUMNS = [
+    "Timestamp",
+    "Team_Name",
+    "Simulation_Year",
+    "Carbon_Tax",
+    "Green_Subsidy",
+    "Regulation_Level",
+    "GDP_Trillion",
+    "CO2_Gt",
+    "Renewable_Percent",
+    "Public_Approval",
+    "Political_Capital",
+    "Global_Temp_Rise",
+    "Event_Name",
+    "Status",
+    "Cumulative_Score",
+    "Run_Seed"
+]
+LAST_COLUMN = chr(ord("A") + len(SHEET_COLUMNS) - 1)
+# One logged turn: the journal's (team, run, year), as it shows in the sheet
+KEY_COLUMNS = ("Team_Name", "Run_Seed", "Simulation_Year")
+
+
+SHEET_TITLE = "UN Policy Architect – Master Control"
+SECRETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".streamlit", "secrets.toml")
+
+
+def column_letter(name):
+    return chr(ord("A") + SHEET_COLUMNS.index(name))
+
+
+def row_key(row):
+    # Same key for a journal row and for the sheet's copy of it (numbers may
+    # come back as int, float or string)
+    key = []
+    for name in KEY_COLUMNS:
+        i = SHEET_COLUMNS.index(name)
+        value = row[i] if i < len(row) else ""
+        if name != "Team_Name":
+            try:
+                value = int(float(value))
+            except (TypeError, ValueError):
+                pass
+        key.append(str(value))
+    return tuple(key)
+
+
+# Numbers come back raw, but dates as text: unformatted, the USER_ENTERED
+# Timestamp would be a serial day number (45812.53)
+READ_OPTIONS = {"value_render_option": "UNFORMATTED_VALUE", "date_time_render_option": "FORMATTED_STRING"}
+
+
+class GspreadBackend:
+    def __init__(self, sheet_factory):
+        # sheet_factory opens the worksheet; called lazily on first use
+        self._sheet_factory = sheet_factory
+        self._sheet = None
+
+    @property
+    def sheet(self):
+        if self._sheet is None:
+            self._sheet = self._sheet_factory()
+        return self._sheet
+
+    def append_rows(self, rows):
+        self.sheet.append_rows(rows, value_input_option="USER_ENTERED")
+
+    def tail_rows(self, n):
+        # The last n rows: one read of column A for the length, one ranged read
+        last = len(self.sheet.col_values(1))
+        return self.read_rows(max(2, last - n + 1)) if last > 1 else []
+
+    def read_rows(self, start_row):
+        # Ranged read of everything from start_row down, raw numbers rather than display strings
+        return self.sheet.get(f"A{start_row}:{LAST_COLUMN}", **READ_OPTIONS)
+
+    def read_chunks(self, start_row, chunk_rows=2000, chunks_per_call=5):
+        # Yields lists of rows, chunk_rows at a time; each batch_get fetches
+        # several consecutive ranges. Stops at the first chunk that is not full.
+        while True:
+            ranges = [
+                f"A{start_row + i * chunk_rows}:{LAST_COLUMN}{start_row + (i + 1) * chunk_rows - 1}"
+                for i in range(chunks_per_call)
+            ]
+            for value_range in self.sheet.batch_get(ranges, **READ_OPTIONS):
+                rows = list(value_range)
+                if rows:
+                    yield rows
+                if len(rows) < chunk_rows:
+                    return
+            start_row += chunks_per_call * chunk_rows
+
+    def update_column(self, name, start_row, values):
+        # One ranged batch_update for the whole column instead of a call per cell
+        letter = column_letter(name)
+        end_row = start_row + len(values) - 1
+        self.sheet.batch_update(
+            [{"range": f"{letter}{start_row}:{letter}{end_row}", "values": [["" if v is None else v] for v in values]}],
+            value_input_option="USER_ENTERED"
+        )
+
+
+class CsvSheetBackend:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        if not os.path.exists(path):
+            self.append_rows([SHEET_COLUMNS])
+
+    def append_rows(self, rows):
+        with self._lock, open(self.path, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read_rows(self, start_row):
+        with self._lock, open(self.path, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        return rows[start_row - 1:]
+
+    def tail_rows(self, n):
+        return self.read_rows(2)[-n:]
+
+    def read_chunks(self, start_row, chunk_rows=2000, chunks_per_call=5):
+        rows = self.read_rows(start_row)
+        for i in range(0, len(rows), chunk_rows):
+            yield rows[i:i + chunk_rows]
+
+    def update_column(self, name, start_row, values):
+        col = SHEET_COLUMNS.index(name)
+        with self._lock:
+            with open(self.path, newline="", encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+            for offset, value in enumerate(values):
+                row = rows[start_row - 1 + offset]
+                row.extend([""] * (col + 1 - len(row)))
+                row[col] = "" if value is None else value
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerows(rows)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+
+def sheet_backend_from_secrets(path=SECRETS_PATH):
+    # For command-line tools that run outside Streamlit
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    with open(path, "rb") as f:
+        info = dict(tomllib.load(f)["gcp_service_account"])
+    info["private_key"] = info["private_key"].replace("\\n", "\n")
+    creds = Credentials.from_service_account_info(info, scopes=["https://www.googleapis.com/auth/spreadsheets"])
+    return GspreadBackend(lambda: gspread.authorize(creds).open(SHEET_TITLE).sheet1)
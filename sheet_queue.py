@@ -0,0 +1,219 @@
+import fcntl
+import logging
+import threading
+import time
+
+from google.auth.exceptions import TransportError
+from gspread.exceptions import APIError
+
+from metrics import REGISTRY
+from sheet_backends import row_key
+
+# ----------------------------------------------------
+# WRITE-BEHIND RECONCILER FOR THE MASTER CONTROL SHEET
+# ----------------------------------------------------
+# One instance is shared by every session (see get_write_queue in
+# basetrial2.py). Sessions journal their row locally (turn_journal.py) and
+# return straight away; a single background thread pushes unsynced journal
+# rows to the sheet backend in append_rows batches, spaced out so the whole
+# process stays under the Sheets per-minute write quota. While the sheet is
+# unreachable rows simply stay in the journal, and anything left unsynced by
+# a previous process is picked up on start.
+#
+# With several app replicas sharing one data directory, every replica
+# journals its own turns but only one drains the journal: the thread first
+# takes an exclusive lock on `writer_lock`, and the other replicas' threads
+# wait on it, taking over if the writer process dies. The writer polls the
+# journal every `poll_interval` seconds for rows journaled elsewhere.
+#
+# Any failure inside the loop leaves the rows in the journal. Quota errors
+# and dropped connections (APIError, TransportError, OSError) are retried
+# with backoff for as long as they last. Anything else (expired credentials,
+# a missing sheet, a bug) is logged and retried at most `max_unexpected`
+# times in a row; then the writer stops, sets `error` and the
+# sheet_writer_stopped gauge (shown on the admin page), and gives the writer
+# lock up so another replica can take over. Rows still in the journal are
+# sent by whichever process writes next, e.g. this one after a restart.
+#
+# A failed append is ambiguous: a timeout may come after Sheets committed
+# the rows. Before the next append the writer reads the sheet's tail and
+# marks rows already there (same Team_Name, Run_Seed, Simulation_Year) as
+# synced instead of sending them twice.
+
+log = logging.getLogger(__name__)
+
+PENDING = "pending"
+FLUSHED = "flushed"
+
+
+class SheetWriteQueue:
+    def __init__(self, journal, backend, writes_per_minute=50, max_batch=200, max_backoff=32,
+                 writer_lock=None, poll_interval=2, max_unexpected=5):
+        self.journal = journal
+        self.backend = backend
+        self.writer_lock = writer_lock
+        self._poll_interval = poll_interval if writer_lock else None
+        self._min_interval = 60.0 / writes_per_minute
+        self._max_batch = max_batch
+        self._max_backoff = max_backoff
+        self._max_unexpected = max_unexpected
+
+        self._cond = threading.Condition()
+        self._dirty = True            # journal may hold unsynced rows
+        self._last_write = 0.0
+        self._unconfirmed = False     # last append failed; it may have landed anyway
+        self.is_writer = writer_lock is None
+        self._lock_file = None
+
+        self.api_calls = 0
+        self.retries = 0
+        self.last_error = None
+        self.error = None             # why the writer stopped, if it did
+
+        self._thread = threading.Thread(target=self._run, name="sheet-write-queue", daemon=True)
+        self._thread.start()
+
+    # --- session side ---
+    def submit(self, team, run, year, row):
+        seq = self.journal.record(team, run, year, row)
+        with self._cond:
+            self._dirty = True
+            self._cond.notify_all()
+        return seq
+
+    def status(self, ticket):
+        return FLUSHED if self.journal.is_synced(ticket) else PENDING
+
+    def pending(self):
+        return self.journal.pending_count()
+
+    def flush(self, timeout=None):
+        # Blocks until the journal has nothing left to sync
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while (self._dirty and self.is_writer) or self.journal.pending_count():
+                if self.error is not None:
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(1 if remaining is None else min(remaining, 1))
+        return True
+
+    # --- writer thread ---
+    def _become_writer(self):
+        # Blocks until this process holds the writer lock (kept until it exits)
+        self._lock_file = open(self.writer_lock, "a")
+        while True:
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                time.sleep(self._poll_interval)
+        self.is_writer = True
+        REGISTRY.set_gauge("sheet_writer", 1)
+
+    def _release_writer(self):
+        if self._lock_file is not None:
+            self._lock_file.close()   # drops the flock
+            self._lock_file = None
+            self.is_writer = False
+            REGISTRY.set_gauge("sheet_writer", 0)
+
+    def _take_batch(self):
+        while True:
+            with self._cond:
+                while not self._dirty:
+                    # Rows journaled by other replicas cannot notify us
+                    if not self._cond.wait(self._poll_interval):
+                        break
+                self._dirty = False
+            batch = self.journal.unsynced(self._max_batch)
+            if batch:
+                return batch
+            with self._cond:
+                self._cond.notify_all()
+
+    def _drop_landed(self, batch):
+        # Rows of the batch the sheet already holds are marked synced, not re-sent
+        self.api_calls += 1
+        REGISTRY.inc("sheet_api_calls_total")
+        with REGISTRY.span("sheet_read_tail"):
+            present = {row_key(row) for row in self.backend.tail_rows(2 * self._max_batch)}
+        landed = [seq for seq, row in batch if row_key(row) in present]
+        if landed:
+            self.journal.mark_synced(landed)
+            REGISTRY.inc("sheet_duplicates_skipped_total", len(landed))
+        return [(seq, row) for seq, row in batch if row_key(row) not in present]
+
+    def _run(self):
+        try:
+            self._drain()
+        except BaseException:
+            log.exception("Sheet writer thread stopped; unsynced rows stay in the journal")
+            raise
+        finally:
+            self._release_writer()
+
+    def _drain(self):
+        if not self.is_writer:
+            REGISTRY.set_gauge("sheet_writer", 0)
+            self._become_writer()
+        backoff = 1
+        unexpected = 0                # unexpected failures in a row
+        while True:
+            # Rate limit: never start a write sooner than _min_interval after the last one.
+            # Rows that arrive meanwhile simply join the next batch.
+            wait = self._last_write + self._min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            try:
+                batch = self._take_batch()
+                if self._unconfirmed:
+                    batch = self._drop_landed(batch)
+                    self._unconfirmed = False
+                REGISTRY.set_gauge("sheet_pending_rows", self.journal.pending_count())
+                if batch:
+                    self.api_calls += 1
+                    REGISTRY.inc("sheet_api_calls_total")
+                    self._last_write = time.monotonic()
+                    self._unconfirmed = True
+                    with REGISTRY.span("sheet_append_rows"):
+                        self.backend.append_rows([row for _, row in batch])
+                    self.journal.mark_synced([seq for seq, _ in batch])
+                    self._unconfirmed = False
+            except Exception as e:
+                # The rows stay in the journal. Quota errors and dropped
+                # connections are routine; anything else (expired token,
+                # sheet not found, journal errors) is logged.
+                if not isinstance(e, (APIError, TransportError, OSError)):
+                    unexpected += 1
+                    REGISTRY.inc("sheet_unexpected_errors_total")
+                    if unexpected >= self._max_unexpected:
+                        log.exception("Sheet writer stopped after %d failures in a row", unexpected)
+                        self.error = f"{type(e).__name__}: {e}"
+                        REGISTRY.set_gauge("sheet_writer_stopped", 1)
+                        with self._cond:
+                            self._cond.notify_all()
+                        return
+                    log.exception("Sheet write failed, retrying in %ss", backoff)
+                self.retries += 1
+                self.last_error = str(e)
+                REGISTRY.inc("sheet_retries_total")
+                REGISTRY.inc("sheet_backoff_seconds_total", backoff)
+                with self._cond:
+                    self._dirty = True
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self._max_backoff)
+                continue
+
+            backoff = 1
+            unexpected = 0
+            self.last_error = None
+            REGISTRY.inc("sheet_rows_written_total", len(batch))
+            REGISTRY.set_gauge("sheet_pending_rows", self.journal.pending_count())
+            with self._cond:
+                # A full batch may have left more behind
+                self._dirty = self._dirty or len(batch) == self._max_batch
+                self._cond.notify_all()
@@ -0,0 +1,321 @@
+import os
+import random
+
+import numpy as np
+
+from events import NO_EVENT, load_event_table
+
+# ----------------------------------------------------
+# MODEL CONSTANTS (shared by the app and batch tools)
+# ----------------------------------------------------
+START_YEAR = 2025
+END_YEAR = 2050
+
+STAT_KEYS = [
+    'GDP (Trillion $)',
+    'CO2 (Gt)',
+    'Global Temp Rise',
+    'Public Approval',
+    'Political Capital',
+    'Renewable %'
+]
+GDP, CO2, TEMP, APPROVAL, CAPITAL, RENEWABLE = range(len(STAT_KEYS))
+
+INITIAL_STATS = {
+    'GDP (Trillion $)': 5.0,
+    'CO2 (Gt)': 450,
+    'Global Temp Rise': 1.1,
+    'Public Approval': 60,
+    'Political Capital': 100, # Currency to spend on policies
+    'Renewable %': 15
+}
+
+# Coefficients of the turn model. apply_policy and step_batch read them from
+# here unless given another set; balancing tools (sweep.py) build variants
+# with model_params().
+MODEL_PARAMS = {
+    # Political Capital cost per slider step, and regeneration per turn
+    "tax_cost": 2,
+    "subsidy_cost": 3,
+    "regulation_cost": 4,
+    "capital_regen": 18,
+    # GDP growth per turn: base, minus tax/regulation drag, plus subsidy boost
+    "base_growth": 0.023,
+    "tax_drag": 0.002,
+    "regulation_drag": 0.001,
+    "subsidy_boost": 0.0015,
+    # CO2 cut (Gt) and renewable share gained per slider step
+    "tax_co2": 3.2,
+    "subsidy_co2": 2.7,
+    "regulation_co2": 2.2,
+    "subsidy_renewable": 1.2,
+    # Warming per turn above / at or below the CO2 threshold (Gt)
+    "co2_threshold": 400,
+    "warming_high": 0.05,
+    "warming_low": 0.01,
+    # Approval: recession penalty, heat penalty above heat_threshold (°C),
+    # bonus for subsidies above subsidy_approval_level
+    "recession_approval": -2,
+    "heat_threshold": 1.5,
+    "heat_approval": -5,
+    "subsidy_approval_level": 5,
+    "subsidy_approval": 3
+}
+
+# --- EVENT SYSTEM ---
+# Defined in events.toml and compiled once per process (see events.py)
+EVENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "events.toml")
+EVENT_TABLE = load_event_table(EVENTS_PATH, STAT_KEYS)
+EVENTS = EVENT_TABLE.events
+EVENT_EFFECTS = EVENT_TABLE.effects  # one row per event, STAT_KEYS order
+
+
+def model_params(overrides=None):
+    # A full parameter set: MODEL_PARAMS with `overrides` applied
+    overrides = overrides or {}
+    unknown = set(overrides) - set(MODEL_PARAMS)
+    if unknown:
+        raise ValueError(f"unknown model parameter(s): {', '.join(sorted(unknown))}")
+    return {**MODEL_PARAMS, **overrides}
+
+
+def policy_costs(params=None):
+    # Political Capital per step of tax, subsidy, regulation; policy @ this is its cost
+    p = MODEL_PARAMS if params is None else params
+    return np.array([p["tax_cost"], p["subsidy_cost"], p["regulation_cost"]])
+
+
+def initial_states(n):
+    # (n, len(STAT_KEYS)) float array, every row at the 2025 starting point
+    row = np.array([INITIAL_STATS[key] for key in STAT_KEYS], dtype=float)
+    return np.tile(row, (n, 1))
+
+
+def stats_to_row(stats):
+    return np.array([stats[key] for key in STAT_KEYS], dtype=float)
+
+
+def row_to_stats(row):
+    return {key: float(row[i]) for i, key in enumerate(STAT_KEYS)}
+
+
+def draw_event_uniforms(rng, n):
+    # (n, 2) uniforms per turn: trigger, then pick, as resolve_events uses them.
+    # Sharing these across runs gives every run the same luck, while which
+    # event it turns into still depends on each run's own state.
+    return rng.random((n, 2))
+
+
+# ----------------------------------------------------
+# SCALAR TURN (one team, one stats dict)
+# ----------------------------------------------------
+# The interactive path: calculate_turn in basetrial2.py wraps these with the
+# session-state bookkeeping. step_batch below must stay in step with them.
+def apply_policy(s, tax, subsidy, regulation, params=None):
+    # Updates the stats dict in place; returns False, leaving it untouched,
+    # when the policy costs more Political Capital than is available.
+    # `params` is a full set from model_params(), MODEL_PARAMS by default.
+    p = MODEL_PARAMS if params is None else params
+
+    # 1. Costs (Political Capital)
+    cost = (tax * p["tax_cost"]) + (subsidy * p["subsidy_cost"]) + (regulation * p["regulation_cost"])
+    if s['Political Capital'] < cost:
+        return False
+
+    # 2. Update Stats
+    s['Political Capital'] -= cost
+    s['Political Capital'] += p["capital_regen"] # Natural regeneration per turn
+
+    # Economics
+    gdp_growth = p["base_growth"] - (tax * p["tax_drag"]) - (regulation * p["regulation_drag"]) + (subsidy * p["subsidy_boost"])
+    s['GDP (Trillion $)'] *= (1 + gdp_growth)
+
+    # Environment
+    co2_reduction = (tax * p["tax_co2"]) + (subsidy * p["subsidy_co2"]) + (regulation * p["regulation_co2"])
+    s['CO2 (Gt)'] -= co2_reduction
+    s['Renewable %'] += (subsidy * p["subsidy_renewable"])
+
+    # Feedback Loops
+    if s['CO2 (Gt)'] > p["co2_threshold"]: s['Global Temp Rise'] += p["warming_high"]
+    else: s['Global Temp Rise'] += p["warming_low"]
+
+    # Public Opinion
+    approval_change = 0
+    if gdp_growth < 0: approval_change += p["recession_approval"]
+    if s['Global Temp Rise'] > p["heat_threshold"]: approval_change += p["heat_approval"]
+    if subsidy > p["subsidy_approval_level"]: approval_change += p["subsidy_approval"]
+    s['Public Approval'] = max(0, min(100, s['Public Approval'] + approval_change))
+
+    # Clamp values
+    s['Renewable %'] = min(100, s['Renewable %'])
+    s['CO2 (Gt)'] = max(0, s['CO2 (Gt)'])
+    return True
+
+
+def turn_rng(seed, year):
+    # Event stream for one turn of a seeded run. Derived from (seed, year)
+    # alone, so a run replays from its logged seed and a restored session
+    # needs no saved generator state.
+    return random.Random(seed * 10_000 + year)
+
+
+def event_message(event):
+    # The narrative logged as Event_Name
+    if event is None:
+        return "🕊️ Status: Global situation stable."
+    return f"🚨 ALERT: {event['name']} - {event['msg']}"
+
+
+def new_event_state():
+    # Per-run event timers (see events.py) as plain lists, so they can live in
+    # session_state and checkpoints
+    timers, active = EVENT_TABLE.new_state()
+    return {"timers": timers.tolist(), "active": active.tolist()}
+
+
+def resolve_events(s, rng, event_state):
+    # Draws this turn's event from `rng` (anything with random(), e.g. turn_rng),
+    # adds it and any still-running effects to the stats dict in one step and
+    # updates event_state in place. Returns the new event dict, or None.
+    event, total = EVENT_TABLE.resolve(s, event_state["timers"], event_state["active"], rng.random(), rng.random())
+    if total is not None:
+        for key, delta in zip(STAT_KEYS, total):
+            if delta:
+                s[key] += delta
+    return None if event == NO_EVENT else EVENTS[event]
+
+
+# ----------------------------------------------------
+# BATCH TURN KERNEL
+# ----------------------------------------------------
+# Vectorised twin of calculate_turn + trigger_random_event. Advances every
+# trajectory by one turn. `states` is (n, 6) in STAT_KEYS order, `years` is
+# the year each row is about to enact. Policies may be scalars or (n,) arrays.
+# Pass `events` (an index per row, NO_EVENT for none) to force outcomes, or
+# `draws` (see draw_event_uniforms) to fix the luck; otherwise events are
+# drawn from `rng`. `event_state` is the (timers, active) pair from
+# EVENT_TABLE.new_state(n), fresh if omitted. `params` as for apply_policy.
+#
+# Returns (states, years, ok, game_over, events, event_state) as new arrays. Rows that
+# cannot afford the policy, or whose game already ended, are left untouched
+# and report ok=False, matching the early return in calculate_turn.
+def step_batch(states, years, tax, subsidy, regulation, events=None, rng=None, finished=None,
+               event_state=None, draws=None, params=None):
+    p = MODEL_PARAMS if params is None else params
+    states = np.array(states, dtype=float)
+    years = np.array(years, dtype=int)
+    n = states.shape[0]
+    tax = np.broadcast_to(np.asarray(tax, dtype=float), (n,))
+    subsidy = np.broadcast_to(np.asarray(subsidy, dtype=float), (n,))
+    regulation = np.broadcast_to(np.asarray(regulation, dtype=float), (n,))
+    if finished is None:
+        finished = np.zeros(n, dtype=bool)
+
+    gdp = states[:, GDP]
+    co2 = states[:, CO2]
+    temp = states[:, TEMP]
+    approval = states[:, APPROVAL]
+    capital = states[:, CAPITAL]
+    renewable = states[:, RENEWABLE]
+
+    # 1. Costs (Political Capital)
+    cost = (tax * p["tax_cost"]) + (subsidy * p["subsidy_cost"]) + (regulation * p["regulation_cost"])
+    ok = (capital >= cost) & ~finished
+
+    # 2. Update Stats
+    new_capital = capital - cost + p["capital_regen"] # Natural regeneration per turn
+
+    # Economics
+    gdp_growth = p["base_growth"] - (tax * p["tax_drag"]) - (regulation * p["regulation_drag"]) + (subsidy * p["subsidy_boost"])
+    new_gdp = gdp * (1 + gdp_growth)
+
+    # Environment
+    co2_reduction = (tax * p["tax_co2"]) + (subsidy * p["subsidy_co2"]) + (regulation * p["regulation_co2"])
+    new_co2 = co2 - co2_reduction
+    new_renewable = renewable + (subsidy * p["subsidy_renewable"])
+
+    # Feedback Loops
+    new_temp = temp + np.where(new_co2 > p["co2_threshold"], p["warming_high"], p["warming_low"])
+
+    # Public Opinion
+    approval_change = (
+        np.where(gdp_growth < 0, p["recession_approval"], 0)
+        + np.where(new_temp > p["heat_threshold"], p["heat_approval"], 0)
+        + np.where(subsidy > p["subsidy_approval_level"], p["subsidy_approval"], 0)
+    )
+    new_approval = np.clip(approval + approval_change, 0, 100)
+
+    # Clamp values
+    new_renewable = np.minimum(100, new_renewable)
+    new_co2 = np.maximum(0, new_co2)
+
+    out = states.copy()
+    out[ok, GDP] = new_gdp[ok]
+    out[ok, CO2] = new_co2[ok]
+    out[ok, TEMP] = new_temp[ok]
+    out[ok, APPROVAL] = new_approval[ok]
+    out[ok, CAPITAL] = new_capital[ok]
+    out[ok, RENEWABLE] = new_renewable[ok]
+
+    # --- END CONDITION CHECK (BEFORE increment) ---
+    game_over = finished | (ok & (years >= END_YEAR))
+    advancing = ok & ~game_over
+    next_years = np.where(advancing, years + 1, years)
+
+    # --- Random events, only for turns that moved to a new year ---
+    timers, active = EVENT_TABLE.new_state(n) if event_state is None else event_state
+    if events is None and draws is None:
+        if rng is None:
+            rng = np.random.default_rng()
+        draws = draw_event_uniforms(rng, n)
+    if events is None:
+        events, effect, new_timers, new_active = EVENT_TABLE.resolve_batch(out, timers, active, draws[:, 0], draws[:, 1])
+    else:
+        events, effect, new_timers, new_active = EVENT_TABLE.resolve_batch(out, timers, active, None, None, forced=events)
+    events = np.where(advancing, events, NO_EVENT)
+    if effect is not None:
+        effect[~advancing] = 0
+        out += effect
+    if not EVENT_TABLE.stateless:
+        timers = np.where(advancing[:, None], new_timers, timers)
+        active = np.where(advancing[:, None], new_active, active)
+
+    return out, next_years, ok, game_over, events, (timers, active)
+
+
+def _schedule(policy, n, turns):
+    policy = np.asarray(policy, dtype=float)
+    if policy.ndim == 1:
+        policy = policy[:, None]
+    return np.broadcast_to(policy, (n, turns))
+
+
+# Runs whole games: tax/subsidy/regulation are (n, turns) schedules, (n,)
+# per-game constants or scalars. A turn that cannot be afforded is skipped
+# and the same year is retried with the next scheduled policy, like a team
+# clicking again. Returns the final states plus the per-turn trajectory of
+# shape (n, turns, 6), holding the stats as logged to the sheet that turn.
+def simulate_games(tax, subsidy, regulation, n=None, rng=None, states=None, params=None):
+    turns = END_YEAR - START_YEAR + 1
+    if n is None:
+        n = max(np.shape(p)[0] if np.ndim(p) else 1 for p in (tax, subsidy, regulation))
+    tax = _schedule(tax, n, turns)
+    subsidy = _schedule(subsidy, n, turns)
+    regulation = _schedule(regulation, n, turns)
+    if rng is None:
+        rng = np.random.default_rng()
+
+    states = initial_states(n) if states is None else np.array(states, dtype=float)
+    years = np.full(n, START_YEAR)
+    finished = np.zeros(n, dtype=bool)
+    event_state = EVENT_TABLE.new_state(n)
+    trajectory = np.empty((n, turns, len(STAT_KEYS)))
+
+    for t in range(turns):
+        states, years, _, finished, _, event_state = step_batch(
+            states, years, tax[:, t], subsidy[:, t], regulation[:, t],
+            rng=rng, finished=finished, event_state=event_state, params=params
+        )
+        trajectory[:, t] = states
+
+    return states, trajectory
@@ -0,0 +1,143 @@
+import numpy as np
+
+from scoring import cumulative_scores, round_like_python
+from simulation import (
+    APPROVAL, CAPITAL, CO2, END_YEAR, EVENT_TABLE, GDP,
+    INITIAL_STATS, NO_EVENT, RENEWABLE, START_YEAR, TEMP,
+    draw_event_uniforms, policy_costs, row_to_stats, stats_to_row, step_batch
+)
+
+# ----------------------------------------------------
+# POLICY SOLVER ("ADVISOR")
+# ----------------------------------------------------
+# Beam search over the full 21 x 21 x 11 policy grid, one year at a time.
+# Every surviving plan is expanded with every affordable policy in a single
+# step_batch call, near-identical states are merged on a coarse grid (keeping
+# the better one), and the best `beam_width` carry on. Plans are ranked by
+# the score they would get if the game ended that year; in 2050 that is the
+# real objective.
+#
+# expected=True plans against the average event (the event table's weights
+# and durations folded into one mean shock per turn, conditions ignored),
+# then re-ranks the final beam by its Monte Carlo mean score over shared
+# event scenarios.
+
+TAX_LEVELS = np.arange(0, 21)
+SUBSIDY_LEVELS = np.arange(0, 21)
+REGULATION_LEVELS = np.arange(0, 11)
+
+ACTIONS = np.stack(
+    np.meshgrid(TAX_LEVELS, SUBSIDY_LEVELS, REGULATION_LEVELS, indexing="ij"), axis=-1
+).reshape(-1, 3)
+ACTION_COST = ACTIONS @ policy_costs()
+
+MEAN_EVENT_EFFECT = EVENT_TABLE.mean_effect
+
+# Merge grid for near-duplicate states, in STAT_KEYS order
+STATE_BINS = np.array([0.01, 1.0, 0.01, 1.0, 1.0, 0.5])
+_HASH = np.random.default_rng(0).integers(1, 2 ** 62, size=len(STATE_BINS))
+
+
+def score_states(states, rounded=False):
+    return cumulative_scores(
+        states[:, GDP], states[:, CO2], states[:, TEMP],
+        states[:, CAPITAL], states[:, RENEWABLE], states[:, APPROVAL],
+        rounded=rounded
+    )
+
+
+def _expand(states, years, mean_field):
+    # Every (plan, affordable policy) pair, advanced one turn without random events
+    affordable = ACTION_COST[None, :] <= states[:, CAPITAL][:, None]
+    parent, action = np.nonzero(affordable)
+    policy = ACTIONS[action]
+    new_states, new_years, _, game_over, _, _ = step_batch(
+        states[parent], years[parent], policy[:, 0], policy[:, 1], policy[:, 2],
+        events=np.full(len(parent), NO_EVENT)
+    )
+    if mean_field:
+        new_states[~game_over] += MEAN_EVENT_EFFECT
+    return parent, action, new_states, new_years
+
+
+def _prune(states, value, width):
+    # Cheap cut first, then keep the best state per grid cell, then the top `width`
+    if len(value) > 50 * width:
+        candidates = np.argpartition(-value, 50 * width)[:50 * width]
+    else:
+        candidates = np.arange(len(value))
+    candidates = candidates[np.argsort(-value[candidates], kind="stable")]
+    cells = np.floor(states[candidates] / STATE_BINS).astype(np.int64) @ _HASH
+    _, first = np.unique(cells, return_index=True)
+    best = candidates[np.sort(first)]
+    return best[:width]
+
+
+def _beam_search(start, start_year, beam_width, mean_field):
+    states = start[None, :]
+    years = np.array([start_year])
+    steps = []
+
+    for _ in range(start_year, END_YEAR + 1):
+        parent, action, new_states, new_years = _expand(states, years, mean_field)
+        keep = _prune(new_states, score_states(new_states), beam_width)
+        steps.append((parent[keep], action[keep]))
+        states, years = new_states[keep], new_years[keep]
+
+    # Walk the parent pointers back to recover each surviving plan
+    plans = np.empty((len(states), len(steps), 3), dtype=int)
+    index = np.arange(len(states))
+    for t in range(len(steps) - 1, -1, -1):
+        parent, action = steps[t]
+        plans[:, t] = ACTIONS[action[index]]
+        index = parent[index]
+    return plans, states
+
+
+# Scores fixed year-by-year plans (P, T, 3) under `scenarios` sets of event
+# draws shared by every plan. A policy the team can no longer afford (after an
+# Oil Lobby Strike, say) falls back to doing nothing that year.
+def evaluate_plans(plans, start=None, start_year=START_YEAR, scenarios=256, seed=0):
+    plans = np.asarray(plans)
+    n_plans, turns, _ = plans.shape
+    start = stats_to_row(INITIAL_STATS) if start is None else np.asarray(start, dtype=float)
+    rng = np.random.default_rng(seed)
+    draws = np.stack([draw_event_uniforms(rng, scenarios) for _ in range(turns)], axis=1)
+
+    states = np.tile(start, (n_plans * scenarios, 1))
+    years = np.full(n_plans * scenarios, start_year)
+    finished = np.zeros(n_plans * scenarios, dtype=bool)
+    event_state = EVENT_TABLE.new_state(n_plans * scenarios)
+    for t in range(turns):
+        policy = np.repeat(plans[:, t], scenarios, axis=0)
+        cost = policy @ policy_costs()
+        policy[cost > states[:, CAPITAL]] = 0
+        states, years, _, finished, _, event_state = step_batch(
+            states, years, policy[:, 0], policy[:, 1], policy[:, 2],
+            draws=np.tile(draws[:, t], (n_plans, 1)), finished=finished, event_state=event_state
+        )
+    return score_states(states, rounded=True).reshape(n_plans, scenarios)
+
+
+def solve_policy(start_stats=None, start_year=START_YEAR, beam_width=64, expected=False, scenarios=256, seed=0):
+    start = stats_to_row(INITIAL_STATS if start_stats is None else start_stats)
+    plans, final_states = _beam_search(start, start_year, beam_width, mean_field=expected)
+
+    if expected:
+        scores = evaluate_plans(plans, start, start_year, scenarios, seed)
+        mean = scores.mean(axis=1)
+        best = int(np.argmax(mean))
+        score, spread = float(round_like_python(mean[best])), float(scores[best].std())
+    else:
+        best, spread = 0, 0.0
+        score = float(score_states(final_states[:1], rounded=True)[0])
+
+    return {
+        "policies": [
+            (start_year + t, int(tax), int(subsidy), int(regulation))
+            for t, (tax, subsidy, regulation) in enumerate(plans[best])
+        ],
+        "final_stats": None if expected else row_to_stats(final_states[best]),
+        "score": score,
+        "score_std": spread
+    }
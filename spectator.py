@@ -0,0 +1,128 @@
+import threading
+import time
+
+import numpy as np
+
+from charts import build_spectator_figure
+from metrics import REGISTRY
+from sheet_backends import SHEET_COLUMNS
+from simulation import END_YEAR, START_YEAR
+
+# ----------------------------------------------------
+# SPECTATOR FEED
+# ----------------------------------------------------
+# Process-wide aggregator behind the spectator page (see get_spectator_feed
+# in basetrial2.py). write_to_master_sheet publishes every logged turn here
+# in memory, so the room display never reads the Master Control sheet. Each
+# team's current run is kept as a fixed (years x metrics) array; a team
+# that resets starts a new trajectory. Rows journaled by other replicas
+# (and before this process started) are pulled from the shared turn journal
+# at most once per poll window, whatever the number of viewers.
+#
+# Viewers poll the feed from a fragment. The overlay figure is built once
+# per feed version and metric and handed to every viewer as is.
+
+# Picker label -> sheet column
+SPECTATOR_METRICS = {
+    "Global Temp Rise (°C)": "Global_Temp_Rise",
+    "Cumulative Score": "Cumulative_Score",
+    "CO2 (Gt)": "CO2_Gt",
+    "GDP (Trillion $)": "GDP_Trillion",
+    "Renewable %": "Renewable_Percent",
+    "Public Approval": "Public_Approval",
+    "Political Capital": "Political_Capital"
+}
+METRIC_COLS = [SHEET_COLUMNS.index(column) for column in SPECTATOR_METRICS.values()]
+YEARS = np.arange(START_YEAR, END_YEAR + 1)
+SYNC_BATCH = 1000   # journal rows per read while catching up
+
+
+class _Trajectory:
+    __slots__ = ("run", "updated", "values")
+
+    def __init__(self, run, updated):
+        self.run = run
+        self.updated = updated
+        self.values = np.full((len(YEARS), len(METRIC_COLS)), np.nan)
+
+
+class TrajectoryFeed:
+    def __init__(self, journal=None, poll=2):
+        self.journal = journal
+        self.poll = poll
+        self._sync_lock = threading.Lock()   # one journal read at a time
+        self._lock = threading.Lock()        # guards everything below
+        self._teams = {}                     # team -> _Trajectory of its current run
+        self._version = 0
+        self._seq = 0                        # last journal row applied
+        self._last_sync = 0.0
+        self._figures = {}                   # metric label -> (version, figure)
+
+    def _apply(self, team, run, year, row, at):
+        i = int(year) - START_YEAR
+        if not 0 <= i < len(YEARS):
+            return False
+        try:
+            values = [float(row[col]) for col in METRIC_COLS]
+        except (IndexError, TypeError, ValueError):
+            return False
+        trajectory = self._teams.get(team)
+        if trajectory is None or trajectory.run != run:
+            if trajectory is not None and at < trajectory.updated:
+                return False   # late row from a run the team has since reset
+            trajectory = self._teams[team] = _Trajectory(run, at)
+        elif not np.isnan(trajectory.values[i, 0]):
+            return False       # already seen (published here and journaled)
+        trajectory.values[i] = values
+        trajectory.updated = max(trajectory.updated, at)
+        return True
+
+    def publish(self, team, run, year, row, at=None):
+        # Called on the click path with the sheet row; cheap and never blocks on I/O
+        with self._lock:
+            if self._apply(team, run, year, row, time.time() if at is None else at):
+                self._version += 1
+
+    def sync(self, force=False):
+        # Catch up with the shared journal; viewers inside the poll window skip it
+        if self.journal is None:
+            return False
+        with self._sync_lock:
+            if not force and time.monotonic() - self._last_sync < self.poll:
+                return False
+            self._last_sync = time.monotonic()
+            changed = False
+            while True:
+                rows = self.journal.since(self._seq, SYNC_BATCH)
+                with self._lock:
+                    for seq, team, run, year, row, created in rows:
+                        if self._apply(team, run, year, row, created):
+                            self._version += 1
+                            changed = True
+                        self._seq = seq
+                if len(rows) < SYNC_BATCH:
+                    return changed
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def team_count(self):
+        return len(self._teams)
+
+    def figure(self, metric):
+        # Shared, so nobody may modify it
+        with self._lock:
+            version = self._version
+            cached = self._figures.get(metric)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            j = list(SPECTATOR_METRICS).index(metric)
+            series = {team: trajectory.values[:, j].copy() for team, trajectory in sorted(self._teams.items())}
+        with REGISTRY.span("spectator_figure"):
+            fig = build_spectator_figure(YEARS, series, metric)
+        with self._lock:
+            if self._figures.get(metric, (-1, None))[0] < version:
+                self._figures[metric] = (version, fig)
+        return fig
@@ -0,0 +1,206 @@
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from scoring import SCORE_WEIGHTS, cumulative_scores
+from simulation import (
+    APPROVAL, CAPITAL, CO2, END_YEAR, EVENT_TABLE, GDP, MODEL_PARAMS, RENEWABLE, START_YEAR, TEMP,
+    initial_states, model_params, policy_costs, step_batch
+)
+
+# ----------------------------------------------------
+# PARAMETER SWEEP (GAME BALANCING)
+# ----------------------------------------------------
+# Evaluates many variants of the model at once. Each point is a set of
+# MODEL_PARAMS overrides plus, as weight.<name>, score weight overrides
+# (see scoring.SCORE_WEIGHTS). At every point, each strategy in STRATEGIES
+# (one policy held from 2025 to 2050, doing nothing in years it cannot be
+# afforded) plays SCENARIOS event scenarios. The event draws come from the
+# same seed at every point, so points differ only by their parameters.
+# Points are spread over a process pool.
+#
+# Per point the report gives:
+#   score_*          spread of final scores over every game
+#   best_*, top      the strategies with the highest mean score
+#   best_dominance   share of scenarios the best strategy also wins outright
+#   near_best        strategies within NEAR_BEST points of the best mean
+#                    (1 means a single dominant strategy)
+#   temp_*, breach_2c, under_1_5   distribution of the 2050 temperature
+#
+#   python sweep.py --vary base_growth=0.015:0.03 --vary co2_threshold=350:450 --grid 5
+#   python sweep.py --vary tax_co2=2:4 --vary weight.gdp=0.15:0.35 --lhs 64
+#   python sweep.py --vary capital_regen=12,18,24     # explicit values
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUT = os.path.join(BASE_DIR, "data", "sweep.csv")
+WEIGHT_PREFIX = "weight."
+SEED = 2050
+SCENARIOS = 32
+TURNS = END_YEAR - START_YEAR + 1
+NEAR_BEST = 1.0
+TOP = 3
+
+# Every other slider step: 11 x 11 x 6 held policies
+STRATEGIES = np.stack(
+    np.meshgrid(np.arange(0, 21, 2), np.arange(0, 21, 2), np.arange(0, 11, 2), indexing="ij"), axis=-1
+).reshape(-1, 3)
+
+
+def parse_vary(text):
+    # "name=lo:hi" -> (name, (lo, hi)); "name=a,b,c" -> (name, [a, b, c])
+    name, sep, spec = text.partition("=")
+    name = name.strip()
+    if not sep:
+        raise ValueError(f"{text!r}: expected name=lo:hi or name=a,b,c")
+    is_weight = name.startswith(WEIGHT_PREFIX) and name.removeprefix(WEIGHT_PREFIX) in SCORE_WEIGHTS
+    if name not in MODEL_PARAMS and not is_weight:
+        raise ValueError(f"unknown parameter {name!r}")
+    if ":" in spec:
+        lo, hi = (float(v) for v in spec.split(":"))
+        return name, (lo, hi)
+    return name, [float(v) for v in spec.split(",")]
+
+
+def grid_points(space, steps):
+    axes = [
+        np.linspace(values[0], values[1], steps).tolist() if isinstance(values, tuple) else values
+        for values in space.values()
+    ]
+    return [dict(zip(space, combo)) for combo in itertools.product(*axes)]
+
+
+def latin_hypercube(space, n, seed=SEED):
+    # One sample per stratum on every axis, strata paired at random
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, values in space.items():
+        u = (rng.permutation(n) + rng.random(n)) / n
+        if isinstance(values, tuple):
+            columns[name] = values[0] + u * (values[1] - values[0])
+        else:
+            columns[name] = np.asarray(values)[(u * len(values)).astype(int)]
+    return [{name: float(column[i]) for name, column in columns.items()} for i in range(n)]
+
+
+def evaluate_point(point, scenarios=SCENARIOS, seed=SEED):
+    params = model_params({k: v for k, v in point.items() if not k.startswith(WEIGHT_PREFIX)})
+    weights = {k.removeprefix(WEIGHT_PREFIX): v for k, v in point.items() if k.startswith(WEIGHT_PREFIX)}
+
+    n_strategies = len(STRATEGIES)
+    n = n_strategies * scenarios
+    policy = np.repeat(STRATEGIES, scenarios, axis=0).astype(float)
+    cost = policy @ policy_costs(params)
+    draws = np.random.default_rng(seed).random((TURNS, scenarios, 2))
+
+    states = initial_states(n)
+    years = np.full(n, START_YEAR)
+    finished = np.zeros(n, dtype=bool)
+    event_state = EVENT_TABLE.new_state(n)
+    for t in range(TURNS):
+        held = np.where((states[:, CAPITAL] >= cost)[:, None], policy, 0)
+        states, years, _, finished, _, event_state = step_batch(
+            states, years, held[:, 0], held[:, 1], held[:, 2],
+            draws=np.tile(draws[t], (n_strategies, 1)), finished=finished,
+            event_state=event_state, params=params
+        )
+
+    scores = cumulative_scores(
+        states[:, GDP], states[:, CO2], states[:, TEMP],
+        states[:, CAPITAL], states[:, RENEWABLE], states[:, APPROVAL],
+        weights=weights or None
+    ).reshape(n_strategies, scenarios)
+    temps = states[:, TEMP]
+
+    mean = scores.mean(axis=1)
+    ranked = np.argsort(-mean, kind="stable")
+    best = ranked[0]
+    score_p5, score_p50, score_p95 = np.percentile(scores, (5, 50, 95))
+    temp_p5, temp_p50, temp_p95 = np.percentile(temps, (5, 50, 95))
+    return {
+        **point,
+        "score_mean": round(float(scores.mean()), 2),
+        "score_std": round(float(scores.std()), 2),
+        "score_p5": round(float(score_p5), 2),
+        "score_p50": round(float(score_p50), 2),
+        "score_p95": round(float(score_p95), 2),
+        "best_strategy": "/".join(str(int(v)) for v in STRATEGIES[best]),
+        "best_score": round(float(mean[best]), 2),
+        "best_margin": round(float(mean[best] - mean[ranked[1]]), 2),
+        "best_dominance": round(float((scores[best] >= scores.max(axis=0)).mean()), 3),
+        "near_best": int((mean >= mean[best] - NEAR_BEST).sum()),
+        "strategy_spread": round(float(mean[best] - np.median(mean)), 2),
+        "top": " ".join(f"{'/'.join(str(int(v)) for v in STRATEGIES[i])}={mean[i]:.1f}" for i in ranked[:TOP]),
+        "temp_p5": round(float(temp_p5), 3),
+        "temp_p50": round(float(temp_p50), 3),
+        "temp_p95": round(float(temp_p95), 3),
+        "breach_2c": round(float((temps >= 2.0).mean()), 3),
+        "under_1_5": round(float((temps <= 1.5).mean()), 3)
+    }
+
+
+def _evaluate_chunk(args):
+    points, scenarios, seed = args
+    return [evaluate_point(point, scenarios, seed) for point in points]
+
+
+def sweep(points, scenarios=SCENARIOS, seed=SEED, workers=None):
+    if workers == 1 or len(points) < 2:
+        return _evaluate_chunk((points, scenarios, seed))
+    workers = workers or os.cpu_count() or 1
+    size = max(1, len(points) // (workers * 4))
+    chunks = [(points[i:i + size], scenarios, seed) for i in range(0, len(points), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [row for chunk in pool.map(_evaluate_chunk, chunks) for row in chunk]
+
+
+def write_csv(rows, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep model parameters and report score, strategy and temperature spreads")
+    parser.add_argument("--vary", action="append", default=[], metavar="NAME=LO:HI|A,B,C",
+                        help=f"parameter to vary: one of MODEL_PARAMS, or {WEIGHT_PREFIX}<score weight>")
+    sampling = parser.add_mutually_exclusive_group()
+    sampling.add_argument("--grid", type=int, default=3, help="values per LO:HI range in a full grid (default 3)")
+    sampling.add_argument("--lhs", type=int, help="draw this many Latin hypercube points instead of a grid")
+    parser.add_argument("--scenarios", type=int, default=SCENARIOS, help="event scenarios per strategy")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    args = parser.parse_args()
+
+    try:
+        space = dict(parse_vary(text) for text in args.vary)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.lhs:
+        points = latin_hypercube(space, args.lhs, args.seed)
+    else:
+        points = grid_points(space, args.grid) if space else []
+    # The current model first, for reference
+    points.insert(0, {name: MODEL_PARAMS.get(name, SCORE_WEIGHTS.get(name.removeprefix(WEIGHT_PREFIX))) for name in space})
+
+    started = time.perf_counter()
+    rows = sweep(points, args.scenarios, args.seed, args.workers)
+    write_csv(rows, args.out)
+
+    games = len(points) * len(STRATEGIES) * args.scenarios
+    print(f"{len(points)} points, {games} games in {time.perf_counter() - started:.1f}s -> {args.out}")
+    for row in rows:
+        settings = " ".join(f"{name}={row[name]:g}" for name in space) or "current model"
+        print(
+            f"{settings:<48} score p50 {row['score_p50']:6.2f} [{row['score_p5']:.1f}..{row['score_p95']:.1f}]"
+            f"  best {row['best_strategy']:<9} {row['best_score']:6.2f} (near {row['near_best']:3d})"
+            f"  temp p50 {row['temp_p50']:.2f}  breach {row['breach_2c']:.0%}"
+        )
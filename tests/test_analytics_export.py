@@ -0,0 +1,73 @@
+import pandas as pd
+
+from analytics_export import build_aggregates, export, load_turns
+from sheet_backends import READ_OPTIONS, GspreadBackend
+
+
+def sheet_row(year, event, timestamp="2026-05-01 12:30:00", team="A"):
+    return [timestamp, team, year, 4, 6, 2, 5.1, 400.0, 21.5, 55, 80, 1.25, event, "ONGOING", 61.2, 12345]
+
+
+class ChunkBackend:
+    # Hands back rows as a real sheet read would, in one chunk
+    def __init__(self, rows):
+        self.rows = rows
+
+    def read_chunks(self, start_row, chunk_rows=2000):
+        yield self.rows[start_row - 2:]
+
+
+class RecordingSheet:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, range_name, **options):
+        self.calls.append(options)
+        return []
+
+    def batch_get(self, ranges, **options):
+        self.calls.append(options)
+        return [[]]
+
+
+def test_numeric_timestamp_is_read_as_a_sheets_serial_date(tmp_path):
+    # UNFORMATTED_VALUE turns a USER_ENTERED date into days since 1899-12-30
+    rows = [sheet_row(2025, "x", timestamp=45812.53), sheet_row(2026, "x")]
+    assert export(ChunkBackend(rows), str(tmp_path)) == 2
+    turns = load_turns(str(tmp_path)).sort_values("Sheet_Row")
+    assert list(turns["Timestamp"]) == [pd.Timestamp("2025-06-04 12:43:12"), pd.Timestamp("2026-05-01 12:30:00")]
+
+
+def test_gspread_reads_dates_as_text():
+    sheet = RecordingSheet()
+    backend = GspreadBackend(lambda: sheet)
+    backend.read_rows(2)
+    list(backend.read_chunks(2))
+    assert sheet.calls == [READ_OPTIONS, READ_OPTIONS]
+    assert READ_OPTIONS["date_time_render_option"] == "FORMATTED_STRING"
+
+
+def test_final_year_does_not_count_the_previous_event_again(tmp_path):
+    alert = "🚨 ALERT: Super-Typhoon - Coastal cities flooded."
+    calm = "🕊️ Status: Global situation stable."
+    rows = [sheet_row(2048, calm), sheet_row(2049, alert), sheet_row(2050, alert)]
+    export(ChunkBackend(rows), str(tmp_path))
+    events = build_aggregates(load_turns(str(tmp_path)))["event_frequencies"]
+    counts = dict(zip(events["Event"], events["Count"]))
+    assert counts == {"Super-Typhoon": 1, "None": 1}
+
+
+def test_trajectory_keeps_only_the_latest_run_of_a_team_that_reset(tmp_path):
+    abandoned = [sheet_row(year, "x") for year in range(2025, 2031)]
+    for row in abandoned:
+        row[15], row[6] = 111, 9.9
+    restarted = [sheet_row(year, "x") for year in range(2025, 2028)]
+    for row in restarted:
+        row[15], row[6] = 222, 5.5
+    other = [sheet_row(2025, "x", team="B")]
+    export(ChunkBackend(abandoned + restarted + other), str(tmp_path))
+    trajectories = build_aggregates(load_turns(str(tmp_path)))["trajectories"]
+    a = trajectories[trajectories["Team_Name"] == "A"]
+    assert list(a["Simulation_Year"]) == [2025, 2026, 2027]
+    assert list(a["GDP_Trillion"]) == [5.5, 5.5, 5.5]
+    assert list(trajectories[trajectories["Team_Name"] == "B"]["Simulation_Year"]) == [2025]
@@ -0,0 +1,35 @@
+import pytest
+
+from batch_run import play, schedules
+from simulation import END_YEAR, START_YEAR
+
+
+def rows(team, years, policy=(2, 2, 1)):
+    return [(line_no, team, year, policy, None) for line_no, year in enumerate(years, 2)]
+
+
+def test_schedule_in_any_year_order_is_played_once():
+    years = list(range(END_YEAR, START_YEAR - 1, -1))
+    found = list(schedules(iter(rows("A", years))))
+    assert len(found) == 1
+    turns, summary = play(found[0])
+    assert summary["missing"] == 0 and summary["turns"] == len(years)
+
+
+def test_row_for_a_played_team_is_rejected():
+    stream = rows("A", range(START_YEAR, END_YEAR + 1)) + [(99, "A", 2030, (1, 1, 1), None)]
+    with pytest.raises(ValueError, match="line 99"):
+        list(schedules(iter(stream)))
+
+
+def test_duplicate_year_is_rejected():
+    with pytest.raises(ValueError, match="already has a 2030 row"):
+        list(schedules(iter(rows("A", [2030, 2031, 2030]))))
+
+
+def test_incomplete_schedule_is_played_at_end_of_input():
+    found = list(schedules(iter(rows("A", [2025, 2026]))))
+    assert [schedule["team"] for schedule in found] == ["A"]
+    turns, summary = play(found[0])
+    assert [turn["status"] for turn in turns[:3]] == ["ok", "ok", "missing"]
+    assert summary["missing"] == len(turns) - 2
@@ -0,0 +1,126 @@
+import random
+
+import numpy as np
+import pytest
+
+from events import EventTable
+from regions import RegionalWorld
+from scoring import INITIAL_CO2, INITIAL_GDP, calculate_cumulative_score
+from simulation import (
+    END_YEAR, EVENT_TABLE, EVENTS, INITIAL_STATS, START_YEAR, STAT_KEYS,
+    apply_policy, initial_states, new_event_state, resolve_events, stats_to_row, step_batch, turn_rng
+)
+
+# The vectorised paths (step_batch, EventTable.resolve_batch, a one-region
+# RegionalWorld) must play exactly the games the app's scalar turn plays.
+# Each test replays fixed seeds through both and compares bit for bit.
+
+SEEDS = [0, 1, 7, 2050, 123456789]
+RUNS = 64
+
+
+class Draws:
+    # Feeds resolve_events the uniforms step_batch was given
+    def __init__(self, values):
+        self.values = list(values)
+
+    def random(self):
+        return self.values.pop(0)
+
+
+def scalar_score(s):
+    return calculate_cumulative_score(
+        initial_gdp=INITIAL_GDP, final_gdp=s['GDP (Trillion $)'],
+        initial_co2=INITIAL_CO2, final_co2=s['CO2 (Gt)'],
+        final_temp=s['Global Temp Rise'], political_capital=s['Political Capital'],
+        renewable_pct=s['Renewable %'], public_approval=s['Public Approval']
+    )
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_step_batch_matches_scalar_turns(seed):
+    rng = np.random.default_rng(seed)
+    # Mostly affordable, sometimes not, so skipped turns are covered too
+    schedule = rng.integers(0, [13, 13, 7], size=(END_YEAR - START_YEAR + 8, RUNS, 3))
+
+    states = initial_states(RUNS)
+    years = np.full(RUNS, START_YEAR)
+    finished = np.zeros(RUNS, dtype=bool)
+    event_state = EVENT_TABLE.new_state(RUNS)
+    scalar = [dict(INITIAL_STATS) for _ in range(RUNS)]
+    scalar_events = [new_event_state() for _ in range(RUNS)]
+    scalar_years = [START_YEAR] * RUNS
+
+    for policy in schedule:
+        draws = rng.random((RUNS, 2))
+        states, years, ok, finished, _, event_state = step_batch(
+            states, years, policy[:, 0], policy[:, 1], policy[:, 2],
+            draws=draws, finished=finished, event_state=event_state
+        )
+        for i in range(RUNS):
+            if scalar_years[i] > END_YEAR:
+                assert not ok[i]
+                continue
+            assert apply_policy(scalar[i], *policy[i]) == ok[i]
+            if ok[i]:
+                if scalar_years[i] < END_YEAR:
+                    resolve_events(scalar[i], Draws(draws[i]), scalar_events[i])
+                scalar_years[i] += 1
+            assert np.array_equal(stats_to_row(scalar[i]), states[i])
+            assert scalar_events[i]["timers"] == event_state[0][i].tolist()
+            assert scalar_events[i]["active"] == event_state[1][i].tolist()
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_event_table_batch_matches_scalar(seed):
+    # A table that exercises durations, cooldowns and conditions, unlike the shipped one
+    events = [dict(event) for event in EVENTS]
+    events[0] = dict(events[0], weight=3, duration=3, cooldown=2)
+    events[1] = dict(events[1], conditions=[{"stat": "Global Temp Rise", "op": ">", "value": 1.5}])
+    events[2] = dict(events[2], weight=0.5, conditions=[
+        {"stat": "CO2 (Gt)", "op": ">=", "value": 400}, {"stat": "CO2 (Gt)", "op": "<", "value": 440}
+    ])
+    table = EventTable(events, 0.6, STAT_KEYS)
+
+    rng = np.random.default_rng(seed)
+    states = initial_states(RUNS)
+    states[:, STAT_KEYS.index('Global Temp Rise')] = rng.uniform(1.1, 1.9, RUNS)
+    states[:, STAT_KEYS.index('CO2 (Gt)')] = rng.uniform(380, 460, RUNS)
+    timers, active = table.new_state(RUNS)
+    scalar = [(timers[i].tolist(), active[i].tolist()) for i in range(RUNS)]
+
+    for _ in range(END_YEAR - START_YEAR):
+        u = rng.random((RUNS, 2))
+        fired, total, timers, active = table.resolve_batch(states, timers, active, u[:, 0], u[:, 1])
+        for i in range(RUNS):
+            event, effect = table.resolve(dict(zip(STAT_KEYS, states[i])), *scalar[i], u[i, 0], u[i, 1])
+            assert event == fired[i]
+            expected = np.zeros(len(STAT_KEYS)) if total is None else total[i]
+            assert np.array_equal(np.zeros(len(STAT_KEYS)) if effect is None else np.asarray(effect), expected)
+            assert scalar[i] == (timers[i].tolist(), active[i].tolist())
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_one_region_world_matches_scalar_game(seed):
+    rng = random.Random(seed)
+    run_seed = rng.getrandbits(40)
+    world = RegionalWorld(
+        ["World"], [INITIAL_STATS['GDP (Trillion $)']], [INITIAL_STATS['CO2 (Gt)']],
+        [INITIAL_STATS['Renewable %']], [INITIAL_STATS['Public Approval']],
+        trade_shock={"chance": 0}, seed=run_seed
+    )
+    s = dict(INITIAL_STATS)
+    event_state = new_event_state()
+    year = START_YEAR
+    for _ in range(2 * (END_YEAR - START_YEAR + 1)):
+        if world.game_over:
+            break
+        policy = (rng.randint(0, 12), rng.randint(0, 12), rng.randint(0, 6))
+        ok = apply_policy(s, *policy)
+        assert world.step(*policy)[0] == ok
+        if ok and year < END_YEAR:
+            resolve_events(s, turn_rng(run_seed, year), event_state)
+            year += 1
+        assert world.stats() == s
+    assert world.score() == scalar_score(s)
+    assert world.region_scores()[0] == scalar_score(s)
@@ -0,0 +1,28 @@
+import pytest
+
+from loadtest import FakeWorksheet
+from sheet_backends import GspreadBackend, row_key
+from sheet_queue import SheetWriteQueue
+from turn_journal import TurnJournal
+
+
+def sheet_row(team, year, seed):
+    return ["2026-05-01 12:30:00", team, year, 2, 2, 1, 5.1, 400.0, 21.5, 55, 80, 1.25, "x", "ONGOING", 61.2, seed]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_queue_drains_the_fake_sheet_despite_injected_failures(tmp_path, seed):
+    # The load test's fake must take every argument the real backend sends,
+    # or the writer retries a TypeError instead of the injected APIErrors
+    sheet = FakeWorksheet(error_rate=0.3, seed=seed)
+    journal = TurnJournal(str(tmp_path / "journal.sqlite3"))
+    queue = SheetWriteQueue(journal, GspreadBackend(lambda: sheet), writes_per_minute=6000, max_backoff=0.01)
+    turns = [(team, year) for team in ("A", "B", "C") for year in range(2025, 2031)]
+    for team, year in turns:
+        queue.submit(team, "run", year, sheet_row(team, year, 7))
+        # One write per turn, so failures hit appends and tail reads alike
+        assert queue.flush(30)
+    assert queue.error is None and journal.pending_count() == 0
+    keys = [row_key(row) for row in sheet.rows[1:]]
+    assert sorted(keys) == sorted(row_key(sheet_row(team, year, 7)) for team, year in turns)
+    assert sheet.errors > 0
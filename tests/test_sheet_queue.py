@@ -0,0 +1,129 @@
+import fcntl
+import threading
+import time
+
+import pytest
+
+from sheet_backends import CsvSheetBackend, row_key
+from sheet_queue import SheetWriteQueue
+from turn_journal import TurnJournal
+
+
+def sheet_row(team, year, seed=12345):
+    return ["2026-05-01 12:30:00", team, year, 2, 2, 1, 5.1, 400.0, 21.5, 55, 80, 1.25, "x", "ONGOING", 61.2, seed]
+
+
+class RecordingBackend(CsvSheetBackend):
+    # Notes the time and size of every append; `failures` raise before writing
+    def __init__(self, path, failures=()):
+        self.calls = []
+        self.failures = []
+        super().__init__(path)   # writes the header
+        self.calls.clear()
+        self.failures = list(failures)
+
+    def append_rows(self, rows):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.calls.append((time.monotonic(), len(rows)))
+        super().append_rows(rows)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return TurnJournal(str(tmp_path / "journal.sqlite3"))
+
+
+def test_writes_are_spaced_by_the_rate_limit(tmp_path, journal):
+    backend = RecordingBackend(str(tmp_path / "log.csv"))
+    queue = SheetWriteQueue(journal, backend, writes_per_minute=600)
+    for year in range(2025, 2030):
+        queue.submit("A", "r", year, sheet_row("A", year))
+        time.sleep(0.02)
+    assert queue.flush(5)
+    starts = [at for at, _ in backend.calls]
+    assert all(later - earlier >= 0.1 - 1e-3 for earlier, later in zip(starts, starts[1:]))
+
+
+def test_rows_submitted_during_a_write_join_one_batch(tmp_path, journal):
+    release = threading.Event()
+
+    class SlowBackend(RecordingBackend):
+        def append_rows(self, rows):
+            release.wait(5)
+            super().append_rows(rows)
+
+    backend = SlowBackend(str(tmp_path / "log.csv"))
+    queue = SheetWriteQueue(journal, backend, writes_per_minute=6000)
+    queue.submit("A", "r", 2025, sheet_row("A", 2025))
+    time.sleep(0.1)   # the writer is now blocked on the first row
+    for year in range(2026, 2036):
+        queue.submit("A", "r", year, sheet_row("A", year))
+    release.set()
+    assert queue.flush(5)
+    assert [size for _, size in backend.calls] == [1, 10]
+
+
+def test_network_errors_back_off_and_retry(tmp_path, journal):
+    backend = RecordingBackend(str(tmp_path / "log.csv"), failures=[TimeoutError("timed out"), TimeoutError("timed out")])
+    queue = SheetWriteQueue(journal, backend, writes_per_minute=6000, max_backoff=1)
+    queue.submit("A", "r", 2025, sheet_row("A", 2025))
+    assert queue.flush(10)
+    assert queue.retries == 2 and queue.error is None and queue.last_error is None
+    assert len(backend.read_rows(2)) == 1
+
+
+def test_unexpected_errors_stop_the_writer_and_free_the_lock(tmp_path, journal):
+    backend = RecordingBackend(str(tmp_path / "log.csv"), failures=[TypeError("bad argument")] * 10)
+    lock = str(tmp_path / "writer.lock")
+    queue = SheetWriteQueue(journal, backend, writes_per_minute=6000, max_backoff=1,
+                            writer_lock=lock, poll_interval=0.05, max_unexpected=2)
+    queue.submit("A", "r", 2025, sheet_row("A", 2025))
+    queue._thread.join(10)
+    assert not queue._thread.is_alive()
+    assert queue.error == "TypeError: bad argument"
+    assert queue.flush(1) is False
+    assert queue.pending() == 1   # still journaled for the next writer
+    with open(lock, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    assert [row_key(row) for row in backend.read_rows(2)] == []
+
+
+class LandsThenFails(CsvSheetBackend):
+    # Writes the rows, then fails like a timeout on a committed append
+    def __init__(self, path, ambiguous=2):
+        self.ambiguous = ambiguous
+        super().__init__(path)
+
+    def append_rows(self, rows):
+        super().append_rows(rows)
+        if self.ambiguous and rows[0][0] != "Timestamp":
+            self.ambiguous -= 1
+            raise TimeoutError("read timed out")
+
+
+def test_recording_a_turn_again_returns_its_original_seq(journal):
+    first = journal.record("A", "run-1", 2025, sheet_row("A", 2025))
+    journal.record("A", "run-1", 2026, sheet_row("A", 2026))
+    assert journal.record("A", "run-1", 2025, sheet_row("A", 2025)) == first
+    # Same team and year in a new run is a new turn
+    assert journal.record("A", "run-2", 2025, sheet_row("A", 2025, seed=999)) != first
+    assert journal.pending_count() == 3
+
+
+def test_ambiguous_appends_land_each_turn_exactly_once(tmp_path, journal):
+    backend = LandsThenFails(str(tmp_path / "log.csv"))
+    queue = SheetWriteQueue(journal, backend, writes_per_minute=6000, max_backoff=1)
+    turns = [(team, run, seed, year) for team, run, seed in (("A", "a1", 1), ("A", "a2", 2), ("B", "b1", 3))
+             for year in range(2025, 2029)]
+    for i, (team, run, seed, year) in enumerate(turns):
+        queue.submit(team, run, year, sheet_row(team, year, seed))
+        # Re-submitting, as a rerun of the same click would, changes nothing
+        queue.submit(team, run, year, sheet_row(team, year, seed))
+        if i % 5 == 4:
+            time.sleep(0.05)
+    assert queue.flush(15)
+    assert backend.ambiguous == 0
+    keys = [row_key(row) for row in backend.read_rows(2)]
+    assert sorted(keys) == sorted(row_key(sheet_row(team, year, seed)) for team, _, seed, year in turns)
+    assert queue.pending() == 0
@@ -0,0 +1,96 @@
+import random
+
+import numpy as np
+import pytest
+
+from simulation import INITIAL_STATS, END_YEAR, apply_policy, new_event_state, resolve_events, turn_rng
+from timeline import Timeline
+from turn_history import TurnHistory
+
+
+class Session(dict):
+    # The parts of st.session_state a Timeline uses: item and attribute access
+    __getattr__ = dict.__getitem__
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def new_session(run_seed=77):
+    return Session(
+        year=2025, stats=dict(INITIAL_STATS), event_state=new_event_state(), history=TurnHistory(),
+        game_over=False, last_event="Welcome", event_impact="", run_seed=run_seed
+    )
+
+
+def play_turn(session, policy):
+    # calculate_turn without Streamlit
+    if session.game_over or not apply_policy(session.stats, *policy):
+        return False
+    session.enacted_year = session.year
+    session.last_tax, session.last_subsidy, session.last_regulation = policy
+    session.history.append(session.year, session.stats)
+    if session.year >= END_YEAR:
+        session.game_over = True
+        return True
+    session.year += 1
+    resolve_events(session.stats, turn_rng(session.run_seed, session.enacted_year), session.event_state)
+    return True
+
+
+def replay(policies):
+    session = new_session()
+    for policy in policies:
+        assert play_turn(session, policy)
+    return session
+
+
+def assert_same_game(session, expected):
+    assert session.stats == expected.stats
+    assert session.event_state == expected.event_state
+    assert (session.year, session.game_over) == (expected.year, expected.game_over)
+    assert np.array_equal(session.history.years, expected.history.years)
+    assert np.array_equal(session.history.values, expected.history.values)
+
+
+@pytest.mark.parametrize("seed", [0, 3, 11])
+def test_random_rewinds_match_a_replay_from_scratch(seed):
+    # Every restore, whether a rewind on the current path or a switch to
+    # another branch, must leave the session exactly as replaying that
+    # branch's policies from a new game would
+    rng = random.Random(seed)
+    session = new_session()
+    timeline = Timeline(session)
+    policies = {timeline.root.id: []}
+    for _ in range(600):
+        if rng.random() < 0.15:
+            target = rng.choice(list(timeline.nodes))
+            timeline.restore(target, session)
+            assert_same_game(session, replay(policies[target]))
+            continue
+        policy = (rng.randint(0, 6), rng.randint(0, 6), rng.randint(0, 3))
+        parent = timeline.current.id
+        if play_turn(session, policy):
+            policies[timeline.record(session).id] = policies[parent] + [policy]
+    assert len(timeline.tips()) > 1
+
+
+def test_playing_from_an_earlier_snapshot_forks_and_keeps_the_old_branch():
+    session = new_session()
+    timeline = Timeline(session)
+    for _ in range(4):
+        play_turn(session, (2, 2, 1))
+        timeline.record(session)
+    old_tip = timeline.current
+    fork_point = timeline.path()[2]
+
+    timeline.restore(fork_point.id, session)
+    assert len(session.history) == fork_point.depth
+    play_turn(session, (6, 0, 0))
+    new_tip = timeline.record(session)
+    assert new_tip.parent is fork_point
+    assert {tip.id for tip in timeline.tips()} == {old_tip.id, new_tip.id}
+
+    # Switching back rebuilds the old branch's rows after the common ancestor
+    timeline.restore(old_tip.id, session)
+    assert_same_game(session, replay([(2, 2, 1)] * 4))
@@ -0,0 +1,112 @@
+import itertools
+from collections import namedtuple
+
+from simulation import STAT_KEYS
+
+# ----------------------------------------------------
+# PRACTICE TIMELINE (REWIND AND BRANCHES)
+# ----------------------------------------------------
+# Every turn of a practice run leaves an immutable snapshot: the stats and
+# event timers as tuples, the scalar session fields, the history row that
+# turn appended, and a link to the snapshot it grew from. Snapshots form a
+# tree. A branch is a path from the root, and every branch shares its prefix
+# with the others, so a snapshot costs one row of tuples however many
+# branches pass through it. Nothing is deep-copied.
+#
+# The session's TurnHistory is the materialised current path, and its length
+# is the history cursor. Rewinding to an earlier snapshot on the same path
+# moves the cursor back without touching any row. Switching to another
+# branch rewrites only the rows after the common ancestor (at most one game).
+# Playing a turn from an earlier snapshot forks a new branch and keeps the
+# old one.
+#
+# RNG state needs no saving: each turn's events come from
+# turn_rng(run_seed, year). A fork that replays a year with another policy
+# therefore faces the same draws, which is what a "what if we had taxed
+# harder in 2032" comparison wants.
+
+# Scalar session fields a snapshot restores (besides stats and event_state)
+SNAPSHOT_KEYS = (
+    "year", "enacted_year", "game_over", "last_event", "event_impact",
+    "last_tax", "last_subsidy", "last_regulation"
+)
+
+# depth: history rows on the snapshot's path; row: the (year, stats) row its
+# turn appended to the history, None for the root
+Snapshot = namedtuple("Snapshot", "id parent depth stats timers active row fields")
+
+
+class Timeline:
+    def __init__(self, session_state):
+        # Rooted at the session's state as it is now (a new or a restored run)
+        self._ids = itertools.count()
+        self.nodes = {}
+        self.children = {}
+        self.root = self.current = self._capture(session_state, None, len(session_state.history), None)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def _capture(self, session_state, parent, depth, row):
+        event_state = session_state.event_state
+        snapshot = Snapshot(
+            next(self._ids), parent, depth,
+            tuple(session_state.stats[key] for key in STAT_KEYS),
+            tuple(event_state["timers"]), tuple(event_state["active"]),
+            row, tuple(session_state.get(key) for key in SNAPSHOT_KEYS)
+        )
+        self.nodes[snapshot.id] = snapshot
+        self.children[snapshot.id] = []
+        if parent is not None:
+            self.children[parent.id].append(snapshot.id)
+        return snapshot
+
+    def record(self, session_state):
+        # After a turn: the new state grows from the current snapshot (a fork if it already had children)
+        history = session_state.history
+        row = (int(history.years[-1]), tuple(history.values[-1].tolist()))
+        self.current = self._capture(session_state, self.current, len(history), row)
+        return self.current
+
+    def restore(self, snapshot_id, session_state):
+        target = self.nodes[snapshot_id]
+        history = session_state.history
+
+        # Rows up to the common ancestor are already in place
+        ahead, behind = self.current, target
+        replay = []
+        while ahead.depth > behind.depth:
+            ahead = ahead.parent
+        while behind.depth > ahead.depth:
+            replay.append(behind.row)
+            behind = behind.parent
+        while ahead is not behind:
+            ahead = ahead.parent
+            replay.append(behind.row)
+            behind = behind.parent
+        history.truncate(ahead.depth)
+        for year, values in reversed(replay):
+            history.append(year, dict(zip(STAT_KEYS, values)))
+
+        session_state.stats = dict(zip(STAT_KEYS, target.stats))
+        session_state.event_state = {"timers": list(target.timers), "active": list(target.active)}
+        for key, value in zip(SNAPSHOT_KEYS, target.fields):
+            session_state[key] = value
+        self.current = target
+        return target
+
+    def path(self, snapshot=None):
+        # Root first
+        node = self.current if snapshot is None else snapshot
+        nodes = []
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        return nodes[::-1]
+
+    def tips(self):
+        # The last snapshot of every branch
+        return [self.nodes[i] for i, children in self.children.items() if not children]
+
+    def field(self, snapshot, key):
+        return snapshot.fields[SNAPSHOT_KEYS.index(key)]
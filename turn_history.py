@@ -0,0 +1,86 @@
+import itertools
+
+import numpy as np
+
+from simulation import END_YEAR, START_YEAR, STAT_KEYS
+
+# ----------------------------------------------------
+# PREALLOCATED TURN HISTORY
+# ----------------------------------------------------
+# Columnar store for one team's per-year stats. The 2025–2050 horizon is
+# fixed, so the arrays are sized once and append just writes the next row.
+# Charts read NumPy views of the filled part; a DataFrame is only built when
+# something asks for one.
+
+# Process-wide counter: every history object and every append gets a fresh
+# version, so a version number identifies one exact set of rows.
+_versions = itertools.count(1)
+
+
+class TurnHistory:
+    def __init__(self, capacity=END_YEAR - START_YEAR + 1):
+        self._years = np.zeros(capacity, dtype=int)
+        self._values = np.zeros((capacity, len(STAT_KEYS)), dtype=float)
+        self._size = 0
+        self.version = next(_versions)
+
+    @classmethod
+    def from_arrays(cls, years, values):
+        # Rebuild a history from saved rows (see checkpoints.py)
+        history = cls()
+        size = len(years)
+        if size > len(history._years):
+            history = cls(capacity=size)
+        history._years[:size] = years
+        history._values[:size] = values
+        history._size = size
+        return history
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def empty(self):
+        return self._size == 0
+
+    def append(self, year, stats):
+        if self._size == len(self._years):
+            # Only reached if a game runs past the planned horizon
+            self._years = np.resize(self._years, 2 * len(self._years))
+            self._values = np.resize(self._values, (2 * len(self._values), len(STAT_KEYS)))
+        self._years[self._size] = year
+        row = self._values[self._size]
+        for i, key in enumerate(STAT_KEYS):
+            row[i] = stats[key]
+        self._size += 1
+        self.version = next(_versions)
+
+    def truncate(self, size):
+        # Moves the end back to `size` rows (a rewind, see timeline.py); later appends overwrite the rest
+        if size < self._size:
+            self._size = size
+            self.version = next(_versions)
+
+    @property
+    def years(self):
+        return self._years[:self._size]
+
+    @property
+    def values(self):
+        # (len, len(STAT_KEYS)) view in STAT_KEYS order
+        return self._values[:self._size]
+
+    def column(self, key):
+        if key == "Year":
+            return self.years
+        return self._values[:self._size, STAT_KEYS.index(key)]
+
+    def __getitem__(self, key):
+        return self.column(key)
+
+    def to_frame(self):
+        # For notebooks and exports; the app itself never needs pandas
+        import pandas as pd
+        frame = pd.DataFrame(self.values, columns=STAT_KEYS, copy=False)
+        frame["Year"] = self.years
+        return frame
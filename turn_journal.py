@@ -0,0 +1,83 @@
+import json
+import sqlite3
+import threading
+import time
+
+# ----------------------------------------------------
+# LOCAL TURN JOURNAL
+# ----------------------------------------------------
+# Append-only SQLite (WAL) log of every row destined for the Master Control
+# sheet. A turn is committed here first, on the click path, and pushed to the
+# sheet later by the reconciler in sheet_queue.py. Rows are keyed by
+# (team, run, year): the same turn recorded twice is stored once, while a
+# team that resets starts a new run and keeps its earlier rows. Several app
+# processes on one host can share the file.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS turns (
+    seq     INTEGER PRIMARY KEY AUTOINCREMENT,
+    team    TEXT    NOT NULL,
+    run     TEXT    NOT NULL,
+    year    INTEGER NOT NULL,
+    row     TEXT    NOT NULL,
+    created REAL    NOT NULL,
+    synced  INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (team, run, year)
+);
+CREATE INDEX IF NOT EXISTS turns_unsynced ON turns (seq) WHERE synced = 0;
+"""
+
+
+class TurnJournal:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        # timeout: app replicas sharing this file wait for each other's writes
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(SCHEMA)
+
+    def record(self, team, run, year, row):
+        # Returns the row's sequence number, whether it was new or already journaled
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO turns (team, run, year, row, created) VALUES (?, ?, ?, ?, ?)",
+                (team, run, year, json.dumps(row), time.time())
+            )
+            return self._conn.execute(
+                "SELECT seq FROM turns WHERE team = ? AND run = ? AND year = ?",
+                (team, run, year)
+            ).fetchone()[0]
+
+    def unsynced(self, limit):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, row FROM turns WHERE synced = 0 ORDER BY seq LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [(seq, json.loads(row)) for seq, row in rows]
+
+    def since(self, seq, limit=1000):
+        # Rows journaled after `seq`, by any process sharing the file
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, team, run, year, row, created FROM turns WHERE seq > ? ORDER BY seq LIMIT ?",
+                (seq, limit)
+            ).fetchall()
+        return [(seq, team, run, year, json.loads(row), created) for seq, team, run, year, row, created in rows]
+
+    def mark_synced(self, seqs):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany("UPDATE turns SET synced = 1 WHERE seq = ?", [(seq,) for seq in seqs])
+            self._conn.execute("COMMIT")
+
+    def is_synced(self, seq):
+        with self._lock:
+            found = self._conn.execute("SELECT synced FROM turns WHERE seq = ?", (seq,)).fetchone()
+        return bool(found and found[0])
+
+    def pending_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM turns WHERE synced = 0").fetchone()[0]